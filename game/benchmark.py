@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:41:30 2026
+
+Benchmarks for WordleGuesser, EntropyGuesser, SimilarityGuesser,
+MinVocabGuesser, LookaheadGuesser and EnsembleGuesser. Each guesser solves the
+same seeded random sample of targets from the small and the large vocabulary
+(guessing from the same vocabulary), and the time spent in make_guess, in
+computing hints and in filt is measured separately with perf_counter. The timed
+pass is repeated REPEATS times, with garbage collection paused as in timeit, 
+and the fastest time of each part is kept, since slower passes only measure
+interference from the rest of the machine. Peak 
+memory is measured in a second pass with tracemalloc, so it doesn't slow down
+the timed passes.
+
+Results can be saved as a baseline, and later runs compared against it: any
+timing more than THRESHOLD and more than NOISE_FLOOR slower than the baseline
+is flagged as a regression. Timings only carry over between runs on the same
+machine, so the baseline records the machine it was saved on, is kept out of
+version control, and is only compared against on that machine.
+
+With --hard, the guessers play hard mode, and results are saved and compared
+under their own keys (e.g. "entropy_small_hard"). With --sampled, 
+EntropyGuesser and SimilarityGuesser pick guesses by successive halving over 
+samples of the remaining words (keys end in "_sampled"), without opening books
+so that the early turns are sampled too. The second pass also counts how often
+the sampled pick differs from the exact best guess, the fewest and most 
+remaining words of the sampled turns, and the turns too small to sample.
+
+Usage:
+    python benchmark.py            run and compare against the baseline
+    python benchmark.py --save     run and save the results as the baseline
+    python benchmark.py --hard     run in hard mode
+    python benchmark.py --sampled  run with sampled scoring
+
+@author: Nora Goldfine
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from wordle_guesser import WordleGuesser
+from similarity_guesser import SimilarityGuesser
+from entropy_guesser import EntropyGuesser
+from min_vocab_guesser import MinVocabGuesser
+from lookahead_guesser import LookaheadGuesser
+from ensemble_guesser import EnsembleGuesser
+from test_guessers import get_vocab, SMALL_VOC_FILE, LARGE_VOC_FILE
+
+BASELINE_FILE = '../test_output/benchmark_baseline.json'
+SAMPLE_SIZE = 200
+SEED = 'benchmark'
+MAX_TURNS = 30
+
+#number of timed passes over the targets; the fastest is kept
+REPEATS = 7
+
+#fraction by which a timing can exceed the baseline before it is flagged
+THRESHOLD = 0.2
+
+#seconds per game a timing must also exceed the baseline by before it is 
+#flagged, so parts that take microseconds don't flag timer noise
+NOISE_FLOOR = 10e-6
+
+#timings compared against the baseline
+TIMINGS = ['make_guess', 'hint', 'filt', 'total']
+
+def sample_targets(vocab, size=SAMPLE_SIZE):
+    return sorted(random.Random(SEED).sample(sorted(vocab), size))
+
+def play(guesser, targets):
+    """Solve each word in targets, returning the seconds spent in each part
+    of the game and the number of guesses made."""
+    table = WordleGuesser.get_hint_matrix()
+    timings = {name: 0.0 for name in TIMINGS}
+    guesses = 0
+
+    for target in targets:
+        guesser.reset()
+        for turn in range(MAX_TURNS):
+            start = time.perf_counter()
+            guess = guesser.make_guess()
+            timings['make_guess'] += time.perf_counter() - start
+            guesses += 1
+            if guess is None or guess == target:
+                break
+
+            start = time.perf_counter()
+            hint = table.hint(guess, target)
+            timings['hint'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            guesser.filt(hint)
+            timings['filt'] += time.perf_counter() - start
+    guesser.reset()
+
+    timings['total'] = timings['make_guess'] + timings['hint'] + timings['filt']
+    return timings, guesses
+
+def machine():
+    """Describe the machine and libraries that timings were taken with."""
+    return {'node'      : platform.node(),
+            'platform'  : platform.platform(),
+            'processor' : platform.processor() or platform.machine(),
+            'cpus'      : os.cpu_count(),
+            'python'    : platform.python_version(),
+            'numpy'     : np.__version__}
+
+def measure(guesser, targets, sampled, repeats):
+    """Return the fastest timings of the guesser over repeats timed passes, 
+    the total guesses of a pass and the peak memory of an untimed pass."""
+    WordleGuesser.get_hint_matrix()
+
+    #every pass starts with an empty decision cache so passes are comparable,
+    #and the fastest time of each part over the passes is kept
+    timings = None
+    for i in range(repeats):
+        WordleGuesser.decision_cache.clear()
+        gc.disable()
+        try:
+            pass_timings, guesses = play(guesser, targets)
+        finally:
+            gc.enable()
+        if timings is None:
+            timings = pass_timings
+        else:
+            timings = {name: min(timings[name], pass_timings[name]) for name in TIMINGS}
+
+    #the untimed pass also checks sampled picks against exact scoring
+    WordleGuesser.decision_cache.clear()
+    guesser.check_exact = sampled
+    tracemalloc.start()
+    play(guesser, targets)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return timings, guesses, peak
+
+def benchmark(guesser_type, small_vocab, targets, hard_mode=False, 
+              sampled=False, sample_size=WordleGuesser.SAMPLE_SIZE, 
+              repeats=REPEATS):
+    if sampled == True:
+        #opening books pick the first two guesses, when most words remain, so
+        #without them sampling would hardly ever be used. The books are shared
+        #by every guesser of the type, so they are put back afterwards.
+        books = (guesser_type.first_guess, guesser_type.second_guesses)
+        guesser = guesser_type(small_vocab=small_vocab, set_guesses=False,
+                               hard_mode=hard_mode, approximate=True, 
+                               sample_size=sample_size)
+        guesser_type.first_guess = None
+        guesser_type.second_guesses = None
+        try:
+            timings, guesses, peak = measure(guesser, targets, sampled, repeats)
+        finally:
+            guesser_type.first_guess, guesser_type.second_guesses = books
+    else:
+        guesser = guesser_type(small_vocab=small_vocab, hard_mode=hard_mode)
+        timings, guesses, peak = measure(guesser, targets, sampled, repeats)
+
+    result = {name: timings[name] / len(targets) for name in TIMINGS}
+    result['average guesses'] = guesses / len(targets)
+    result['peak memory MB'] = peak / 2 ** 20
+    if sampled == True:
+        stats = guesser.sampling_stats
+        turns = stats['sampled turns']
+        result['sampled turns'] = turns
+        result['exact turns'] = stats['exact turns']
+        result['fewest sampled'] = stats['fewest sampled']
+        result['most sampled'] = stats['most sampled']
+        result['disagreement rate'] = stats['disagreements'] / turns if turns > 0 else 0.0
+        result['score lost per turn'] = stats['score lost'] / turns if turns > 0 else 0.0
+    return result
+
+def run(hard_mode=False, sampled=False, sample_size=WordleGuesser.SAMPLE_SIZE,
+        repeats=REPEATS):
+    if sampled == True:
+        name2guesser = {'entropy'    : EntropyGuesser,
+                        'similarity' : SimilarityGuesser}
+    else:
+        name2guesser = {'random'     : WordleGuesser,
+                        'entropy'    : EntropyGuesser,
+                        'similarity' : SimilarityGuesser,
+                        'minvocab'   : MinVocabGuesser,
+                        'lookahead'  : LookaheadGuesser,
+                        'ensemble'   : EnsembleGuesser}
+    vocabs = {'small' : (True, get_vocab(SMALL_VOC_FILE)),
+              'large' : (False, get_vocab(LARGE_VOC_FILE))}
+
+    results = dict()
+    for vocab_name in vocabs:
+        small_vocab, vocab = vocabs[vocab_name]
+        targets = sample_targets(vocab)
+        for name in name2guesser:
+            key = f'{name}_{vocab_name}' + ('_hard' if hard_mode == True else '')
+            key += '_sampled' if sampled == True else ''
+            results[key] = benchmark(name2guesser[name], small_vocab, targets, 
+                                     hard_mode, sampled, sample_size, repeats)
+            print(format_result(key, results[key]))
+    return results
+
+def format_result(key, result):
+    timings = ' '.join(f'{name}: {result[name] * 1000:.3f} ms' for name in TIMINGS)
+    text = (f'{key:<31} {timings} | guesses: {result["average guesses"]:.2f} | '
+            f'peak memory: {result["peak memory MB"]:.1f} MB')
+    if 'disagreement rate' in result:
+        text += (f' | differs from exact on {result["disagreement rate"]:.1%} of '
+                 f'{result["sampled turns"]} sampled turns '
+                 f'({result["score lost per turn"]:.4f} score lost per turn)')
+        if result['sampled turns'] > 0:
+            text += (f' with {result["fewest sampled"]} to '
+                     f'{result["most sampled"]} remaining words')
+        text += f', {result["exact turns"]} turns scored exactly'
+    return text
+
+def compare(results, baseline, threshold=THRESHOLD, noise_floor=NOISE_FLOOR):
+    """Return a message for each timing more than threshold and more than
+    noise_floor seconds per game slower than the baseline."""
+    regressions = []
+    for key in results:
+        if key not in baseline:
+            continue
+        for name in TIMINGS:
+            old, new = baseline[key][name], results[key][name]
+            if old > 0 and new > old * (1 + threshold) and new - old > noise_floor:
+                regressions.append(f'{key} {name}: {old * 1000:.3f} ms -> {new * 1000:.3f} ms per game ({new / old - 1:+.0%})')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Wordle guessers.')
+    parser.add_argument('--save', action='store_true',
+                        help='save the results as the new baseline')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    parser.add_argument('--noise-floor', type=float, default=NOISE_FLOOR,
+                        help='seconds per game a timing must slow down by to be flagged')
+    parser.add_argument('--repeats', type=int, default=REPEATS,
+                        help='number of timed passes, of which the fastest is kept')
+    parser.add_argument('--hard', action='store_true', help='play hard mode')
+    parser.add_argument('--sampled', action='store_true', 
+                        help='pick guesses by successive halving over samples')
+    parser.add_argument('--sample-size', type=int, default=WordleGuesser.SAMPLE_SIZE,
+                        help='size of the first sample with --sampled')
+    args = parser.parse_args()
+
+    results = run(args.hard, args.sampled, args.sample_size, args.repeats)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as reader:
+            baseline = json.load(reader)
+        if baseline.get('machine') != machine():
+            #timings from another machine (or a baseline that doesn't say)
+            #can't be compared
+            print(f'{args.baseline} was saved on a different machine')
+            baseline = None
+
+    if args.save:
+        #results of the other modes already in the baseline are kept
+        if baseline is None:
+            baseline = {'machine' : machine(), 'results' : dict()}
+        baseline['results'].update(results)
+        with open(args.baseline, 'w') as writer:
+            json.dump(baseline, writer, indent=2)
+        print(f'saved baseline to {args.baseline}')
+
+    elif baseline is not None:
+        regressions = compare(results, baseline['results'], args.threshold,
+                              args.noise_floor)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if len(regressions) > 0:
+            sys.exit(1)
+        print('no regressions')
+
+if __name__ == '__main__':
+    main()
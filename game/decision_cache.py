@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:32:31 2026
+
+This file contains the DecisionCache class, a bounded least-recently-used cache
+of the guesses a guesser made for each set of remaining possible words. Many 
+puzzles reach the same set of remaining words after the same guesses and hints,
+so guessers only need to score each of these states once.
+
+@author: Nora Goldfine
+"""
+
+from collections import OrderedDict
+
+class DecisionCache:
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+    def get(self, key):
+        """Return the guess stored for key, or None if there is none."""
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        return None
+    
+    def put(self, key, guess):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = guess
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+            
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'entries'   : len(self.entries),
+                'hits'      : self.hits,
+                'misses'    : self.misses,
+                'evictions' : self.evictions,
+                'hit rate'  : self.hits / lookups if lookups > 0 else 0.0}
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:33:21 2026
+
+Compiler for guesser decision trees. A decision tree records every guess a 
+deterministic guesser makes while solving each word in a target vocabulary: 
+the root holds the first guess, and the child reached by each hint holds the 
+guess made after that hint. Trees are saved as JSON and replayed by 
+TreeGuesser, which only has to look up the next guess after each hint.
+
+Each node is a dictionary with the guess ("guess"), the number of target words
+that reach the node ("targets") and, unless every target reaching the node is 
+the guess itself, the child node for each hint ("next").
+
+Running this file compiles trees for the entropy, similarity and minimum 
+vocabulary strategies for the same three experiments as test_guessers.py.
+
+@author: Nora Goldfine
+"""
+
+import json
+import os
+
+from wordle_guesser import WordleGuesser
+from similarity_guesser import SimilarityGuesser
+from entropy_guesser import EntropyGuesser
+from min_vocab_guesser import MinVocabGuesser
+from test_guessers import get_vocab, SMALL_VOC_FILE, LARGE_VOC_FILE
+
+#games are cut off after this many guesses if the guesser hasn't found the 
+#target (the longest recorded game takes 17)
+MAX_TURNS = 30
+
+def compile_tree(guesser, targets, max_turns=MAX_TURNS):
+    """Return the decision tree guesser follows while solving each word in 
+    targets. Targets are split by the hint they give at each node, so the 
+    guesser makes one guess per node rather than one per target per turn."""
+    guesser.reset()
+    tree = _expand(guesser, sorted(targets), 1, max_turns)
+    guesser.reset()
+    return tree
+
+def _expand(guesser, targets, turn, max_turns):
+    """Return the subtree for targets, all of which reach the guesser's 
+    current state on the given turn."""
+    guess = guesser.make_guess()
+    if guess is None:
+        return None
+    
+    node = {'guess': guess, 'targets': len(targets)}
+    if turn == max_turns:
+        return node
+    
+    table = WordleGuesser.get_hint_matrix()
+    groups = dict()
+    for target in targets:
+        if target != guess:
+            groups.setdefault(table.hint(guess, target), []).append(target)
+    
+    children = dict()
+    for hint in sorted(groups):
+        guesser.push(guess, hint)
+        child = _expand(guesser, groups[hint], turn + 1, max_turns)
+        guesser.pop()
+        if child is not None:
+            children[hint] = child
+    if len(children) > 0:
+        node['next'] = children
+    return node
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(child) for child in node.get('next', {}).values())
+
+def save_tree(tree, guesser, tree_file):
+    data = {'strategy'   : type(guesser).__name__,
+            'vocabulary' : WordleGuesser.vocab_key,
+            'tree'       : tree}
+    with open(tree_file, 'w') as writer:
+        json.dump(data, writer, separators=(',', ':'))
+
+def load_tree(tree_file):
+    with open(tree_file, 'r') as reader:
+        return json.load(reader)
+
+def main():
+    
+    small_vocab = get_vocab(SMALL_VOC_FILE)
+    large_vocab = get_vocab(LARGE_VOC_FILE)
+    outloc = '../processed_data'
+    
+    name2guesser = {'entropy'    : EntropyGuesser,
+                    'similarity' : SimilarityGuesser,
+                    'minvocab'   : MinVocabGuesser}
+    
+    experiments = [('small_small', True, small_vocab),
+                   ('large_small', False, small_vocab),
+                   ('large_large', False, large_vocab)]
+    
+    for experiment, small_guesses, targets in experiments:
+        for name in name2guesser:
+            out_file = os.path.join(outloc, f'{name}_{experiment}_tree.json')
+            print(out_file.upper())
+            guesser = name2guesser[name](small_vocab=small_guesses)
+            tree = compile_tree(guesser, targets)
+            save_tree(tree, guesser, out_file)
+            print(f'{count_nodes(tree)} nodes')
+
+if __name__ == '__main__':
+    main()
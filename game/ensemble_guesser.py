@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:09:03 2026
+
+This file contains the EnsembleGuesser class, a subclass of WordleGuesser.
+EnsembleGuesser scores every guess with the entropy, minimum vocabulary and
+similarity strategies and picks the guess with the best combined score.
+
+The strategies share one state: the EntropyGuesser, MinVocabGuesser and
+SimilarityGuesser in guessers read the ensemble's mask of remaining words
+rather than filtering their own, so each hint is only filtered once. Entropy
+and minimum vocabulary scores both come from the hint histogram of each guess,
+which is computed once for both, while similarities (matrix products, which
+run outside the interpreter lock) are computed on a worker thread at the same
+time. Combining strategies therefore costs little more than the slowest of
+them.
+
+Scores are combined in one of two ways:
+ -  'weights': each strategy's scores are scaled to [0, 1] over the guesses
+    and added up, multiplied by the strategy's weight
+ -  'rank': each guess gets one vote per strategy worth its rank among the
+    guesses (0 for the worst score, 1 for the best), multiplied by the
+    strategy's weight
+The per-strategy scores of the last scored turn are kept in scores.
+
+@author: Nora Goldfine
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import numpy as np
+
+from wordle_guesser import WordleGuesser
+from entropy_guesser import EntropyGuesser
+from min_vocab_guesser import MinVocabGuesser
+from similarity_guesser import SimilarityGuesser
+
+class EnsembleGuesser(WordleGuesser):
+
+    STRATEGIES = ('entropy', 'minvocab', 'similarity')
+    WEIGHTS = {'entropy' : 1.0, 'minvocab' : 1.0, 'similarity' : 1.0}
+    INSTRUMENTED = WordleGuesser.INSTRUMENTED + ('best_guess', 'score_guesses',
+                                                'score_strategies', 'combine')
+
+    def __init__(self, set_vocab=True, small_vocab=True, config=None,
+                 hard_mode=False, weights=None, voting='weights', threads=True):
+        WordleGuesser.__init__(self, set_vocab, small_vocab, config, hard_mode)
+
+        #one guesser per strategy, in the order of STRATEGIES, all reading
+        #the ensemble's state
+        self.guessers = [EntropyGuesser(set_vocab=False, set_guesses=False,
+                                        hard_mode=hard_mode),
+                         MinVocabGuesser(set_vocab=False, set_guesses=False,
+                                         hard_mode=hard_mode),
+                         SimilarityGuesser(set_vocab=False, set_guesses=False,
+                                           hard_mode=hard_mode)]
+
+        #weight of each strategy (strategies left out of weights keep their
+        #default weight) and how scores are combined: 'weights' or 'rank'
+        self.weights = dict(EnsembleGuesser.WEIGHTS)
+        if weights is not None:
+            self.weights.update(weights)
+        if voting not in ('weights', 'rank'):
+            raise ValueError(f'unknown voting method {voting}')
+        self.voting = voting
+
+        #compute similarities on a worker thread while the hint histograms
+        #are computed. The thread is started the first time it is needed in
+        #each process, since threads don't survive fork.
+        self.threads = threads
+        self.executor = None
+        self.executor_pid = None
+
+        #strategy -> score of each guess in scored, from the last scored turn
+        self.scores = None
+        self.scored = None
+
+        self.guess_count = 0
+
+    def reset(self):
+        WordleGuesser.reset(self)
+        self.guess_count = 0
+
+    def share_state(self):
+        """Point each strategy's guesser at the ensemble's state."""
+        for guesser in self.guessers:
+            guesser.mask = self.mask
+            guesser.indices = self.candidate_indices()
+            guesser.allowed = self.allowed
+            guesser.allowed_indices = self.allowed_indices
+            guesser.min_counts = self.min_counts
+            guesser.solved = self.solved
+
+    def get_executor(self):
+        if self.executor is None or self.executor_pid != os.getpid():
+            self.executor = ThreadPoolExecutor(1)
+            self.executor_pid = os.getpid()
+        return self.executor
+
+    def decision_key(self):
+        key = WordleGuesser.decision_key(self)
+        weights = ' '.join(f'{self.weights[name]}' for name in EnsembleGuesser.STRATEGIES)
+        return (f'{key[0]} {self.voting} {weights}',) + key[1:]
+
+    ### METHODS FOR GUESSING ###
+
+    def score_strategies(self, guesses):
+        """Return a dictionary from each strategy with a nonzero weight to its
+        score for each guess in guesses (an array of vocabulary indices),
+        where higher scores are better guesses."""
+        self.share_state()
+        entropy, min_vocab, similarity = self.guessers
+        used = [name for name in EnsembleGuesser.STRATEGIES if self.weights[name] != 0]
+
+        similarities = None
+        if 'similarity' in used and self.threads == True:
+            similarities = self.get_executor().submit(similarity.score_guesses, guesses)
+
+        scores = dict()
+        if 'entropy' in used or 'minvocab' in used:
+            table = WordleGuesser.get_hint_matrix()
+            targets = self.candidate_indices()
+            entropies = np.empty(len(guesses))
+            lengths = np.empty(len(guesses), dtype=np.int64)
+            for batch in table.batches(guesses):
+                counts = table.hint_histograms(guesses[batch], targets)
+                if 'entropy' in used:
+                    entropies[batch] = EntropyGuesser.entropy_from_counts(counts, len(targets))
+                if 'minvocab' in used:
+                    lengths[batch] = MinVocabGuesser.lengths_from_counts(guesses[batch], counts)
+            if 'entropy' in used:
+                scores['entropy'] = entropies
+            if 'minvocab' in used:
+                scores['minvocab'] = -1 * lengths
+
+        if similarities is not None:
+            scores['similarity'] = similarities.result()
+        elif 'similarity' in used:
+            scores['similarity'] = similarity.score_guesses(guesses)
+        return scores
+
+    def combine(self, scores):
+        """Return the combined score of each guess from the strategies'
+        scores."""
+        combined = None
+        for name in scores:
+            values = np.asarray(scores[name], dtype=np.float64)
+            if self.voting == 'rank':
+                #rank among the distinct scores, so tied guesses get the
+                #same vote
+                values = np.unique(values, return_inverse=True)[1].ravel().astype(np.float64)
+            else:
+                values = values - values.min()
+            if combined is None:
+                combined = np.zeros(len(values))
+            if values.max() > 0:
+                combined += self.weights[name] * values / values.max()
+        return combined
+
+    def score_guesses(self, guesses):
+        """Return the combined score of each guess in guesses (an array of 
+        vocabulary indices), keeping each strategy's scores in scores. When 
+        every weight is zero, all guesses score 0."""
+        self.scores = self.score_strategies(guesses)
+        self.scored = guesses
+        if len(self.scores) == 0:
+            return np.zeros(len(guesses))
+        return self.combine(self.scores)
+
+    def best_guess(self):
+        """Return the word in the guess pool with the best combined score.
+        Ties go to remaining words, then to the word that comes first
+        alphabetically."""
+        guesses = self.guess_pool()
+        return self.best_scored(guesses, self.score_guesses(guesses))
+
+    def make_guess(self):
+        if len(self.words) == 0:
+            return None
+
+        self.guess_count += 1
+        self.guess = self.cached_guess(self.best_guess)
+        return self.guess
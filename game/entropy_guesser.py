@@ -4,38 +4,51 @@ Created on Thu Mar 10 00:49:14 2022
 
 This file contains the EntropyGuesser class, a subclass of WordleGuesser. 
 EntropyGuesser selects the next guess for a Wordle puzzle by maximizing the 
-entropy over the different puzzle feedback options ("hints").
+entropy over the different puzzle feedback options ("hints"). With approximate
+set, entropies are estimated from samples of the remaining words.
 
 @author: Nora Goldfine
 """
 
 from wordle_guesser import WordleGuesser
-from collections import defaultdict
-import math
+import registry
+import numpy as np
 
 class EntropyGuesser(WordleGuesser):
     
     SMALL_GUESS_FILE = '../processed_data/small_ent_guesses.txt'
     LARGE_GUESS_FILE = '../processed_data/large_ent_guesses.txt'
+    first_guess = None
+    second_guesses = None
+    INSTRUMENTED = WordleGuesser.INSTRUMENTED + ('best_guess', 'score_guesses', 
+                                                'entropy', 'entropy_scores')
+    
+    #histograms of small samples cost more per pair than one exact batch
+    SAMPLING_COST = 2.5
     
     def set_early_guesses(guesses_file):
-        with open(guesses_file, 'r') as reader:
-            lines = reader.readlines()
+        EntropyGuesser.first_guess, EntropyGuesser.second_guesses = registry.get_opening_book(guesses_file)
+    
+    def __init__(self, set_vocab=True, small_vocab=True, set_guesses=True, 
+                 batched=True, config=None, hard_mode=False, approximate=False,
+                 sample_size=WordleGuesser.SAMPLE_SIZE, check_exact=False):
+        WordleGuesser.__init__(self, set_vocab, small_vocab, config, hard_mode)
         
-        first = lines[0]
-        EntropyGuesser.first_guess = first.strip()
+        #score all candidate guesses at once instead of one word at a time
+        self.batched = batched
         
-        seconds = lines[1:]
-        EntropyGuesser.second_guesses = dict()
-        for line in seconds:
-            items = line.split()
-            hint, guess = items[0], items[1]
-            EntropyGuesser.second_guesses[hint] = guess
-                
-    def __init__(self, set_vocab=True, small_vocab=True, set_guesses=True):
-        WordleGuesser.__init__(self, set_vocab, small_vocab)
+        #pick guesses by successive halving over samples of sample_size or 
+        #more remaining words (see WordleGuesser.halving_guess)
+        self.approximate = approximate
+        self.sample_size = sample_size
+        self.check_exact = check_exact
         
-        if set_guesses == True:
+        if set_guesses == True and WordleGuesser.config.opening_books == False:
+            #there are no opening books for this game variant, so the first 
+            #two guesses are scored like the others
+            EntropyGuesser.first_guess = None
+            EntropyGuesser.second_guesses = None
+        elif set_guesses == True:
             if small_vocab == True:
                 guess_file = EntropyGuesser.SMALL_GUESS_FILE
             else:
@@ -50,65 +63,71 @@ class EntropyGuesser(WordleGuesser):
         
     ### METHODS FOR GUESSING ###
     
-    def count_letters(self, word, letter):
-        count = 0
-        for x in word:
-            if x == letter:
-                count += 1
-        return count
-
-    def match_letters(self, target, guess, letter, start_index):
-        count = 0
-        for i in range(start_index, len(guess)):
-            if guess[i] == letter and target[i] == letter:
-                count += 1
-        return count
-    
     def get_hint(self, guess, target):
-        feedback = [WordleGuesser.GRAY] * 5
-        
-        #add green to feedback
-        for i in range(len(guess)):
-            if guess[i] == target[i]:
-                feedback[i] = WordleGuesser.GREEN
-        
-        #add gold to feedback
-        for i in range(len(guess)):
-            if feedback[i] != WordleGuesser.GREEN and guess[i] in target:
-                so_far = self.count_letters(guess[:i+1], guess[i])
-                later_threes = self.match_letters(target, guess, guess[i], i+1)
-                confirmed = so_far + later_threes
-                if confirmed <= self.letter_counts[target][guess[i]]:
-                    feedback[i] = WordleGuesser.GOLD
-                    
-        return ''.join(feedback)
+        return WordleGuesser.get_hint_matrix().hint(guess, target)
     
     def get_hint_counts(self, guess):
-        hint_counts = defaultdict(lambda: 0)
-        for target in self.words:
-            hint = self.get_hint(guess, target)
-            hint_counts[hint] += 1
-        return hint_counts.values()
+        """Return the number of remaining words that give each hint for guess,
+        leaving out hints no remaining word gives."""
+        hint_counts = WordleGuesser.get_hint_matrix().hint_counts(
+            guess, self.candidate_indices())
+        return hint_counts[hint_counts > 0]
+    
+    def entropy_from_counts(counts, total):
+        """Return the entropy of each row of hint counts. Counts are sorted 
+        first so guesses with the same partition sizes get exactly the same
+        score, whatever hints the partitions belong to."""
+        probs = np.sort(counts, axis=-1) / total
+        logprobs = np.log2(np.where(probs > 0, probs, 1))
+        return -1 * (probs * logprobs).sum(axis=-1)
     
     def entropy(self, guess):
-        ent = 0
-        counts = self.get_hint_counts(guess)
-        for count in counts:
-            if count > 0:
-                prob = count / len(self.words)
-                logprob = math.log2(prob)
-                ent += prob * logprob 
-        return -1 * ent
+        counts = WordleGuesser.get_hint_matrix().hint_counts(
+            guess, self.candidate_indices())
+        return float(EntropyGuesser.entropy_from_counts(counts, counts.sum()))
+    
+    def entropy_scores(self, guesses, targets=None):
+        """Return the entropy of each guess in guesses (an array of hint table
+        indices) over targets (by default, the remaining words), histogramming
+        the hints of all guesses in one pass."""
+        if targets is None:
+            targets = self.candidate_indices()
+        table = WordleGuesser.get_hint_matrix()
+        scores = np.empty(len(guesses))
+        for batch in table.batches(guesses):
+            counts = table.hint_histograms(guesses[batch], targets)
+            scores[batch] = EntropyGuesser.entropy_from_counts(counts, len(targets))
+        return scores
+    
+    def score_guesses(self, guesses):
+        """Return a score for each guess in guesses (an array of vocabulary 
+        indices), where higher scores are better guesses."""
+        return self.entropy_scores(guesses)
+    
+    def best_guess(self):
+        """Return the word in the guess pool with the highest entropy. Ties go
+        to remaining words, then to the word that comes first alphabetically."""
+        if self.approximate == True:
+            return self.halving_guess(self.guess_pool(), self.entropy_scores)
+        if self.batched == True:
+            guesses = self.guess_pool()
+            scores = self.entropy_scores(guesses)
+            return self.best_scored(guesses, scores)
+        words = [WordleGuesser.word_list[i] for i in self.guess_pool()]
+        return max(words, key=lambda x: (self.entropy(x), x in self.words))
     
     def make_guess(self):
         if len(self.words) == 0:
             raise ValueError('There are no words that match the hints.')
         
         self.guess_count += 1
-        if self.guess_count == 1:
+        if self.guess_count == 1 and EntropyGuesser.first_guess is not None:
             self.guess = EntropyGuesser.first_guess
-        elif self.guess_count == 2:
+        elif (self.guess_count == 2 and EntropyGuesser.second_guesses is not None and 
+              self.hard_mode == False):
+            #the opening book only looks at the remaining possible words, so
+            #in hard mode the second guess is scored over the allowed guesses
             self.guess = EntropyGuesser.second_guesses[self.hints]
         else:
-            self.guess = max(self.words, key=self.entropy)
+            self.guess = self.cached_guess(self.best_guess)
         return self.guess
\ No newline at end of file
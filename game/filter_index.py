@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:30:46 2026
+
+This file contains the FilterIndex class, which precomputes which words in a 
+vocabulary have each letter in each position and at least each number of 
+copies of each letter. Filtering possible guesses based on a hint then becomes
+a few AND operations over these word masks instead of a check of every word.
+
+@author: Nora Goldfine
+"""
+
+import numpy as np
+
+from hint_matrix import HINT_CHARS, GRAY, GOLD, GREEN
+
+class FilterIndex:
+    
+    def __init__(self, vocabulary):
+        self.words = vocabulary.words
+        self.letter_index = {letter: i for i, letter in enumerate(vocabulary.alphabet)}
+        letters = vocabulary.letters
+        counts = vocabulary.letter_counts
+        
+        #positions[i, letter] is True for words with letter at index i
+        self.positions = np.zeros((letters.shape[1], counts.shape[1], len(self.words)), 
+                                  dtype=bool)
+        for i in range(letters.shape[1]):
+            self.positions[i, letters[:, i], np.arange(len(self.words))] = True
+            
+        #at_least[letter, count] is True for words with at least count copies
+        #of letter, up to one more than the length of a word
+        max_count = letters.shape[1] + 1
+        self.at_least = (counts.T[:, None, :] >= 
+                         np.arange(max_count + 1)[None, :, None])
+        
+    def matching(self, guess, hints, min_counts, indices=None):
+        """Return a mask of the words that are kept after guess gets hints, 
+        where min_counts is the minimum number of times each letter must 
+        appear in the target word. If indices is given, only the words at 
+        those indices are checked and the mask lines up with indices.
+        
+        Gray letters keep words with no more than the minimum count of the 
+        letter, gold letters keep words with at least the minimum count that 
+        don't have the letter in that position, and green letters keep words 
+        with the letter in that position."""
+        if indices is None:
+            indices = slice(None)
+            keep = np.ones(len(self.words), dtype=bool)
+        else:
+            keep = np.ones(len(indices), dtype=bool)
+            
+        for i in range(len(hints)):
+            letter = self.letter_index[guess[i]]
+            if hints[i] == HINT_CHARS[GRAY]:
+                keep &= ~self.at_least[letter, min_counts[guess[i]] + 1][indices]
+            elif hints[i] == HINT_CHARS[GOLD]:
+                keep &= ~self.positions[i, letter][indices]
+                keep &= self.at_least[letter, min_counts[guess[i]]][indices]
+            elif hints[i] == HINT_CHARS[GREEN]:
+                keep &= self.positions[i, letter][indices]
+        return keep
+    
+    def required(self, guess, hints, indices=None):
+        """Return a mask of the words that are allowed guesses in hard mode 
+        after guess gets hints: words with every green letter in the same 
+        position and at least as many copies of each letter as were green or
+        gold. If indices is given, only the words at those indices are 
+        checked and the mask lines up with indices."""
+        if indices is None:
+            indices = slice(None)
+            keep = np.ones(len(self.words), dtype=bool)
+        else:
+            keep = np.ones(len(indices), dtype=bool)
+            
+        revealed = dict()
+        for i in range(len(hints)):
+            letter = self.letter_index[guess[i]]
+            if hints[i] == HINT_CHARS[GREEN]:
+                keep &= self.positions[i, letter][indices]
+            if hints[i] != HINT_CHARS[GRAY]:
+                revealed[letter] = revealed.get(letter, 0) + 1
+        for letter in revealed:
+            keep &= self.at_least[letter, revealed[letter]][indices]
+        return keep
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:53:35 2026
+
+This file contains the GameConfig class, which describes a variant of Wordle:
+the length of the words, the letters they are made of, the number of guesses a
+player gets and the vocabulary files words are guessed from. Hints for words of
+length L are encoded as integers below 3 ** L.
+
+WORDLE is the standard game, and the only one with opening books in the
+processed_data folder. Guessers for other variants score their first two
+guesses like any other guess.
+
+@author: Nora Goldfine
+"""
+
+import string
+
+import numpy as np
+
+ALPHABET = string.ascii_lowercase
+
+def hint_dtype(word_length):
+    """Return the smallest unsigned integer type that holds every hint code
+    for words of word_length letters."""
+    for dtype in [np.uint8, np.uint16, np.uint32]:
+        if 3 ** word_length - 1 <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+class GameConfig:
+
+    def __init__(self, word_length=5, alphabet=ALPHABET, max_guesses=6,
+                 small_vocab_file=None, large_vocab_file=None,
+                 opening_books=False):
+        self.word_length = word_length
+        self.alphabet = alphabet
+        self.max_guesses = max_guesses
+
+        #guessers use the small vocabulary unless told otherwise; if only one
+        #vocabulary is given it is used for both
+        self.small_vocab_file = small_vocab_file or large_vocab_file
+        self.large_vocab_file = large_vocab_file or small_vocab_file
+
+        #whether guessers read their first two guesses from the opening
+        #books in the processed_data folder
+        self.opening_books = opening_books
+
+        self.num_hints = 3 ** word_length
+        self.hint_dtype = hint_dtype(word_length)
+
+    def vocab_file(self, small_vocab=True):
+        return self.small_vocab_file if small_vocab == True else self.large_vocab_file
+
+    def is_word(self, word):
+        return len(word) == self.word_length and all(x in self.alphabet for x in word)
+
+    def __repr__(self):
+        return (f'GameConfig(word_length={self.word_length}, '
+                f'max_guesses={self.max_guesses}, '
+                f'small_vocab_file={self.small_vocab_file!r}, '
+                f'large_vocab_file={self.large_vocab_file!r})')
+
+WORDLE = GameConfig(small_vocab_file='../raw_data/wordle_wins.txt',
+                    large_vocab_file='../raw_data/wordle_vocab.txt',
+                    opening_books=True)
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:27:20 2026
+
+This file contains the HintMatrix class, a precomputed table of the feedback
+("hints") a Wordle puzzle gives for every (guess, target) pair in a vocabulary.
+Hints are stored as compact integer codes (0-242 for five-letter words), one 
+byte per pair, so scoring a guess becomes a lookup over a row of the table 
+instead of recomputing each hint letter by letter. Longer words have 3 ** L 
+hint codes and use wider integers (two bytes from six letters up).
+
+The table is computed once per vocabulary, saved in the processed_data folder
+and memory-mapped whenever it is needed again. Tables that would be too large
+(e.g. for tens of thousands of seven-letter words) are not stored; their hint
+codes are computed as they are needed instead.
+
+@author: Nora Goldfine
+"""
+
+import os
+
+import numpy as np
+
+from game_config import ALPHABET, hint_dtype
+
+#hint digits, in the same order as WordleGuesser.GRAY, GOLD and GREEN
+GRAY, GOLD, GREEN = 0, 1, 2
+HINT_CHARS = '123'
+
+def hint_to_code(hint):
+    """Convert a hint string (e.g. '11213') to its integer code. Codes sort in
+    the same order as hint strings, so '11111' is 0 and '33333' is 242."""
+    code = 0
+    for char in hint:
+        code = code * 3 + HINT_CHARS.index(char)
+    return code
+
+def code_to_hint(code, word_length):
+    """Convert an integer hint code back to a hint string of word_length
+    digits."""
+    chars = []
+    for i in range(word_length):
+        chars.append(HINT_CHARS[code % 3])
+        code //= 3
+    return ''.join(reversed(chars))
+
+def compute_hint(guess, target):
+    """Return the hint string Wordle gives for guess when the solution is
+    target."""
+    feedback = [HINT_CHARS[GRAY]] * len(guess)
+
+    #add green to feedback
+    for i in range(len(guess)):
+        if guess[i] == target[i]:
+            feedback[i] = HINT_CHARS[GREEN]
+
+    #add gold to feedback: a letter is gold if there are enough copies of it
+    #in target to cover all earlier copies in guess plus all green copies
+    for i in range(len(guess)):
+        if feedback[i] != HINT_CHARS[GREEN] and guess[i] in target:
+            so_far = guess[:i+1].count(guess[i])
+            later_greens = sum(1 for j in range(i+1, len(guess))
+                               if guess[j] == guess[i] == target[j])
+            if so_far + later_greens <= target.count(guess[i]):
+                feedback[i] = HINT_CHARS[GOLD]
+
+    return ''.join(feedback)
+
+def hint_digits(codes, word_length):
+    """Return the digits (GRAY, GOLD or GREEN) of each hint code in codes, 
+    with one row per code."""
+    powers = 3 ** np.arange(word_length - 1, -1, -1)
+    return (np.asarray(codes)[:, None] // powers) % 3
+
+def encode_words(words, alphabet=ALPHABET):
+    """Return words as an array of letter indices (positions in alphabet) 
+    with one row per word."""
+    word_length = len(words[0]) if len(words) > 0 else 0
+    table = {ord(letter): i for i, letter in enumerate(alphabet)}
+    data = np.frombuffer(''.join(words).translate(table).encode('latin-1'), 
+                         dtype=np.uint8)
+    return data.reshape(len(words), word_length)
+
+def count_letters(letters, alphabet_size=len(ALPHABET)):
+    """Return an array with one row per word giving how many times each letter
+    of the alphabet appears in the word."""
+    counts = np.zeros((len(letters), alphabet_size), dtype=np.uint8)
+    rows = np.arange(len(letters))
+    for i in range(letters.shape[1]):
+        np.add.at(counts, (rows, letters[:, i]), 1)
+    return counts
+
+def compute_hint_codes(guess_letters, target_letters, target_counts):
+    """Return the hint codes for every pair of guesses and targets, as an
+    array with one row per guess and one column per target."""
+    guesses, length = guess_letters.shape
+    green = guess_letters[:, None, :] == target_letters[None, :, :]
+
+    #same[g, i, j] is True when letters i and j of guess g are the same letter
+    same = guess_letters[:, :, None] == guess_letters[:, None, :]
+
+    dtype = hint_dtype(length)
+    codes = np.zeros((guesses, len(target_letters)), dtype=dtype)
+    for i in range(length):
+        greens = (green & same[:, None, i, :]).sum(axis=2)
+        gray_so_far = (~green[:, :, :i+1] & same[:, None, i, :i+1]).sum(axis=2)
+        available = target_counts[:, guess_letters[:, i]].T
+        gold = ~green[:, :, i] & (gray_so_far + greens <= available)
+        digit = np.where(green[:, :, i], GREEN, gold.astype(np.uint8))
+        codes = codes * 3 + digit.astype(dtype)
+    return codes
+
+def compute_hint_matrix(letters, counts, chunk_size=256):
+    """Compute the hint code for every (guess, target) pair of words, given 
+    as letter index and letter count arrays."""
+    matrix = np.empty((len(letters), len(letters)), 
+                      dtype=hint_dtype(letters.shape[1]))
+    for start in range(0, len(letters), chunk_size):
+        stop = start + chunk_size
+        matrix[start:stop] = compute_hint_codes(letters[start:stop], letters,
+                                                counts)
+    return matrix
+
+class HintMatrix:
+
+    CACHE_DIR = '../processed_data'
+
+    #maximum number of hint codes gathered at once by hint_histograms
+    BATCH_SIZE = 2 ** 18
+    
+    #largest table that is stored; hint codes for larger vocabularies are 
+    #computed as they are needed
+    MAX_TABLE_BYTES = 2 ** 30
+    
+    #maximum number of hint counts in the histograms scored at once
+    HISTOGRAM_SIZE = 2 ** 22
+    
+    def __init__(self, vocabulary, cache_dir=CACHE_DIR):
+        self.vocabulary = vocabulary
+        self.words = vocabulary.words
+        self.index = vocabulary.index
+        self.letters = vocabulary.letters
+        self.letter_counts = vocabulary.letter_counts
+        self.word_length = self.letters.shape[1]
+        self.num_hints = 3 ** self.word_length
+        self.cache_file = os.path.join(cache_dir, self.cache_name())
+        self.matrix = self.load()
+    
+    def cache_name(self):
+        """Name of the file the table is saved in. The name includes a hash of
+        the vocabulary so different vocabularies never share a file."""
+        return f'hints_{len(self.words)}_{self.vocabulary.key[:12]}.npy'
+    
+    def load(self):
+        itemsize = np.dtype(hint_dtype(self.word_length)).itemsize
+        if len(self.words) ** 2 * itemsize > HintMatrix.MAX_TABLE_BYTES:
+            return None
+        if not os.path.exists(self.cache_file):
+            matrix = compute_hint_matrix(self.letters, self.letter_counts)
+            #write to a temporary file first so an interrupted run never
+            #leaves a partial table behind
+            temp_file = self.cache_file + '.tmp'
+            with open(temp_file, 'wb') as writer:
+                np.save(writer, matrix)
+            os.replace(temp_file, self.cache_file)
+        return np.load(self.cache_file, mmap_mode='r')
+
+    def codes(self, guesses, targets):
+        """Return the hint codes of guesses and targets (arrays of indices),
+        with one row per guess and one column per target."""
+        if self.matrix is not None:
+            return self.matrix[guesses].take(targets, axis=1)
+        return compute_hint_codes(self.letters[guesses], self.letters[targets],
+                                  self.letter_counts[targets])
+    
+    def code(self, guess, target):
+        if self.matrix is not None:
+            return self.matrix[self.index[guess], self.index[target]]
+        return hint_to_code(compute_hint(guess, target))
+    
+    def hint(self, guess, target):
+        """Return the hint string for guess and target, computing it directly
+        if either word is not in the table."""
+        if guess in self.index and target in self.index:
+            return code_to_hint(self.code(guess, target), self.word_length)
+        return compute_hint(guess, target)
+    
+    def hint_counts(self, guess, targets):
+        """Return how many of targets (an array of indices) give each hint code
+        for guess."""
+        if self.matrix is not None:
+            row = self.matrix[self.index[guess]][targets]
+        else:
+            row = self.codes(np.array([self.index[guess]]), targets)[0]
+        return np.bincount(row, minlength=self.num_hints)
+
+    def batches(self, guesses, num_groups=1):
+        """Return slices splitting guesses into batches whose histograms (with
+        num_groups histograms per guess) fit in HISTOGRAM_SIZE counts."""
+        batch_size = max(1, HintMatrix.HISTOGRAM_SIZE // (self.num_hints * num_groups))
+        return [slice(start, start + batch_size) 
+                for start in range(0, len(guesses), batch_size)]
+    
+    def hint_histograms(self, guesses, targets):
+        """Return how many of targets give each hint code for each guess in 
+        guesses (both arrays of indices), as an array with one row per guess. 
+        Guesses are histogrammed in chunks small enough to stay in cache."""
+        num_hints = self.num_hints
+        histograms = np.empty((len(guesses), num_hints), dtype=np.int64)
+        chunk_size = max(1, HintMatrix.BATCH_SIZE // max(1, len(targets)))
+        for start in range(0, len(guesses), chunk_size):
+            rows = guesses[start:start+chunk_size]
+            codes = self.codes(rows, targets).astype(np.intp)
+            codes += num_hints * np.arange(len(rows))[:, None]
+            counts = np.bincount(codes.ravel(), minlength=len(rows) * num_hints)
+            histograms[start:start+len(rows)] = counts.reshape(len(rows), num_hints)
+        return histograms
+    
+    def grouped_hint_histograms(self, guesses, targets, groups, num_groups):
+        """Return how many of the targets in each group give each hint code 
+        for each guess in guesses (targets and guesses are arrays of indices,
+        and groups[i] < num_groups is the group of targets[i]), as an array 
+        with one row per guess and one histogram per group in each row. All 
+        groups are histogrammed from the same hint codes."""
+        num_hints = self.num_hints
+        size = num_groups * num_hints
+        histograms = np.empty((len(guesses), num_groups, num_hints), dtype=np.int64)
+        offsets = np.asarray(groups, dtype=np.intp) * num_hints
+        chunk_size = max(1, HintMatrix.BATCH_SIZE // max(1, len(targets)))
+        for start in range(0, len(guesses), chunk_size):
+            rows = guesses[start:start+chunk_size]
+            codes = self.codes(rows, targets).astype(np.intp)
+            codes += offsets[None, :]
+            codes += size * np.arange(len(rows))[:, None]
+            counts = np.bincount(codes.ravel(), minlength=len(rows) * size)
+            histograms[start:start+len(rows)] = counts.reshape(len(rows), num_groups, num_hints)
+        return histograms
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:43:12 2026
+
+This file contains the Instrumentation class, which records how often a
+guesser's methods are called and how long they take. Each class lists the
+methods worth timing in INSTRUMENTED (make_guess and filt for WordleGuesser,
+plus the scoring methods of each strategy). Instrumentation.wrap replaces those
+methods on one guesser instance with timed versions, so guessers that are not
+instrumented run exactly the same code as before and pay nothing for it.
+
+For each method, the number of calls, the total and maximum time, a histogram
+of call times (in power-of-two microsecond buckets) and the mean time at each
+candidate-set size (in power-of-two buckets) are kept. WordleTester also
+times its hint lookups (as "hint") and records the number of possible words at
+each turn of each game.
+
+@author: Nora Goldfine
+"""
+
+from collections import defaultdict
+import math
+import time
+
+class Instrumentation:
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counters = defaultdict(int)
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self.max_seconds = defaultdict(float)
+
+        #method -> power-of-two microsecond bucket -> calls
+        self.timings = defaultdict(lambda: defaultdict(int))
+
+        #method -> power-of-two candidate-set size bucket -> [calls, seconds]
+        self.sizes = defaultdict(lambda: defaultdict(lambda: [0, 0.0]))
+
+        #turn -> [turns played, total possible words]
+        self.turns = defaultdict(lambda: [0, 0])
+
+    ### METHODS FOR RECORDING ###
+
+    def wrap(self, guesser):
+        """Time the methods type(guesser).INSTRUMENTED lists on guesser."""
+        self.unwrap(guesser)
+        for name in type(guesser).INSTRUMENTED:
+            setattr(guesser, name, self.timed(name, getattr(guesser, name), guesser))
+
+    def unwrap(self, guesser):
+        """Remove the timed methods from guesser."""
+        for name in type(guesser).INSTRUMENTED:
+            guesser.__dict__.pop(name, None)
+
+    def timed(self, name, method, guesser):
+        def timed_method(*args, **kwargs):
+            size = len(guesser.candidate_indices())
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            self.record(name, time.perf_counter() - start, size)
+            return result
+        return timed_method
+
+    def record(self, name, seconds, size):
+        """Record one call of name, taking seconds with size possible words
+        left."""
+        self.calls[name] += 1
+        self.seconds[name] += seconds
+        self.max_seconds[name] = max(self.max_seconds[name], seconds)
+
+        microseconds = seconds * 1e6
+        bucket = math.ceil(math.log2(microseconds)) if microseconds > 1 else 0
+        self.timings[name][bucket] += 1
+
+        by_size = self.sizes[name][size.bit_length()]
+        by_size[0] += 1
+        by_size[1] += seconds
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def observe_turn(self, turn, size, games=1):
+        """Record that size words were possible at the start of turn (counting
+        from 1) in games games."""
+        self.turns[turn][0] += games
+        self.turns[turn][1] += games * size
+
+    ### METHODS FOR COMBINING AND EXPORTING ###
+
+    def export(self):
+        """Return the recorded data as plain dictionaries (e.g. to send from a
+        worker process)."""
+        return {'counters'    : dict(self.counters),
+                'calls'       : dict(self.calls),
+                'seconds'     : dict(self.seconds),
+                'max seconds' : dict(self.max_seconds),
+                'timings'     : {name: dict(self.timings[name]) for name in self.timings},
+                'sizes'       : {name: {b: list(v) for b, v in self.sizes[name].items()}
+                                 for name in self.sizes},
+                'turns'       : {turn: list(v) for turn, v in self.turns.items()}}
+
+    def merge(self, data):
+        """Add data returned by another Instrumentation's export."""
+        for name in data['counters']:
+            self.counters[name] += data['counters'][name]
+        for name in data['calls']:
+            self.calls[name] += data['calls'][name]
+            self.seconds[name] += data['seconds'][name]
+            self.max_seconds[name] = max(self.max_seconds[name],
+                                         data['max seconds'][name])
+        for name in data['timings']:
+            for bucket, calls in data['timings'][name].items():
+                self.timings[name][bucket] += calls
+        for name in data['sizes']:
+            for bucket, (calls, seconds) in data['sizes'][name].items():
+                self.sizes[name][bucket][0] += calls
+                self.sizes[name][bucket][1] += seconds
+        for turn, (played, size) in data['turns'].items():
+            self.turns[turn][0] += played
+            self.turns[turn][1] += size
+
+    def summary(self):
+        """Return the recorded data summarized as a JSON-friendly dictionary."""
+        turns = sum(played for played, size in self.turns.values())
+        timers = dict()
+        for name in sorted(self.calls):
+            calls = self.calls[name]
+            timers[name] = {'calls'          : calls,
+                            'calls per turn' : calls / turns if turns > 0 else None,
+                            'total seconds'  : self.seconds[name],
+                            'mean seconds'   : self.seconds[name] / calls,
+                            'max seconds'    : self.max_seconds[name],
+                            'histogram'      : {f'<={2 ** b}us': self.timings[name][b]
+                                                for b in sorted(self.timings[name])},
+                            'by candidates'  : {f'<{2 ** b}': {'calls'        : v[0],
+                                                               'mean seconds' : v[1] / v[0]}
+                                                for b, v in sorted(self.sizes[name].items())}}
+        return {'counters'   : dict(self.counters),
+                'timers'     : timers,
+                'candidates per turn' : {turn: {'turns'           : v[0],
+                                                'mean candidates' : v[1] / v[0]}
+                                         for turn, v in sorted(self.turns.items())}}
+
+    def report(self):
+        """Return the summary as text."""
+        summary = self.summary()
+        lines = []
+        for name in summary['counters']:
+            lines.append(f'{name}: {summary["counters"][name]}')
+        for name, timer in summary['timers'].items():
+            per_turn = timer['calls per turn']
+            per_turn = '' if per_turn is None else f', {per_turn:.2f} per turn'
+            lines.append(f'{name}: {timer["calls"]} calls{per_turn}, '
+                         f'{timer["total seconds"]:.3f} s total, '
+                         f'{timer["mean seconds"] * 1000:.3f} ms mean, '
+                         f'{timer["max seconds"] * 1000:.3f} ms max')
+            for size, v in timer['by candidates'].items():
+                lines.append(f'\t{size} candidates: {v["calls"]} calls, '
+                             f'{v["mean seconds"] * 1000:.3f} ms mean')
+        for turn, v in summary['candidates per turn'].items():
+            lines.append(f'turn {turn}: {v["turns"]} games, '
+                         f'{v["mean candidates"]:.1f} possible words on average')
+        return '\n'.join(lines)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:06:22 2026
+
+This file contains the LookaheadGuesser class, a subclass of EntropyGuesser.
+LookaheadGuesser searches several guesses ("plies") ahead for the guess that
+minimizes the expected number of guesses left, instead of picking the best
+guess one step at a time.
+
+The cost of a guess is the total number of guesses needed to solve every
+remaining word: one for each word, plus the cost of each group of words that
+gives the same hint. Groups are costed by searching again, and after the last
+ply by an estimate that grows like n log n. The search is a branch and bound:
+ -  at each node, only the WIDTH guesses with the highest entropy are tried, in
+    order of entropy, so good guesses are found early
+ -  a guess is skipped when a lower bound on its cost (2n - 1 guesses for each
+    group of n words, since at most one word is found with the next guess) is
+    no better than the best guess found so far, and its groups are abandoned
+    as soon as their costs so far plus the bounds of the rest are
+ -  at the last ply, the cost of every guess is computed at once from its hint
+    histogram
+The search for a turn stops once it has costed NODE_BUDGET guesses (at every
+ply, each guess costed counts as one). When the budget runs out,
+the best guess fully costed so far is returned (or the highest-entropy guess,
+if none is). The budget counts work rather than time, so the same words always
+give the same guess, on any machine. Groups are predicted from exact hints, so
+the search is a model of the game rather than a replay of filt.
+
+The first guess is read from the entropy opening book.
+
+@author: Nora Goldfine
+"""
+
+import numpy as np
+
+from wordle_guesser import WordleGuesser
+from entropy_guesser import EntropyGuesser
+
+class LookaheadGuesser(EntropyGuesser):
+
+    PLIES = 2
+    WIDTH = 10
+
+    #guesses costed when searching for each guess (None for no limit)
+    NODE_BUDGET = 100000
+
+    #the estimated cost of n words after the last ply is n * (1 + log_B(n)),
+    #with B the number of groups a guess splits words into on average
+    LEAF_BRANCHING = 20
+
+    INSTRUMENTED = EntropyGuesser.INSTRUMENTED + ('search',)
+
+    def __init__(self, set_vocab=True, small_vocab=True, set_guesses=True,
+                 config=None, hard_mode=False, plies=PLIES, width=WIDTH,
+                 node_budget=NODE_BUDGET):
+        EntropyGuesser.__init__(self, set_vocab, small_vocab, set_guesses,
+                                config=config, hard_mode=hard_mode)
+        self.plies = plies
+        self.width = width
+        self.node_budget = node_budget
+
+        #number of guesses costed so far in the current search
+        self.nodes = 0
+
+    def decision_key(self):
+        key = EntropyGuesser.decision_key(self)
+        return (f'{key[0]} {self.plies} {self.width} {self.node_budget}',) + key[1:]
+
+    ### METHODS FOR COSTING GUESSES ###
+
+    def lower_bounds(sizes):
+        """Return the fewest total guesses needed to solve groups of sizes
+        words: one for the word guessed next and two for every other word."""
+        return np.maximum(2 * np.asarray(sizes, dtype=np.float64) - 1, 0)
+
+    def leaf_costs(sizes):
+        """Return the estimated total guesses needed to solve groups of sizes
+        words without searching them, which is exact for up to two words and
+        never below the lower bound."""
+        sizes = np.asarray(sizes, dtype=np.float64)
+        bounds = LookaheadGuesser.lower_bounds(sizes)
+        estimates = sizes * (1 + np.log(np.maximum(sizes, 1)) /
+                             np.log(LookaheadGuesser.LEAF_BRANCHING))
+        return np.where(sizes <= 2, bounds, np.maximum(estimates, bounds))
+
+    def out_of_nodes(self):
+        return self.node_budget is not None and self.nodes >= self.node_budget
+
+    def search(self, guesses, targets, plies, bound):
+        """Return the guess in guesses (an array of vocabulary indices) with
+        the lowest cost of solving targets in plies guesses, and its cost. If
+        no guess costs less than bound, the guess is None and the cost is at
+        least bound."""
+        table = WordleGuesser.get_hint_matrix()
+        solved = table.num_hints - 1
+        total = len(targets)
+
+        if plies == 1:
+            self.nodes += len(guesses)
+            costs = np.empty(len(guesses))
+            for batch in table.batches(guesses):
+                counts = table.hint_histograms(guesses[batch], targets)
+                counts[:, solved] = 0
+                costs[batch] = total + LookaheadGuesser.leaf_costs(counts).sum(axis=1)
+            best = np.lexsort((np.arange(len(guesses)), ~self.mask[guesses], costs))[0]
+            if costs[best] >= bound:
+                return None, costs[best]
+            return guesses[best], costs[best]
+
+        entropies = np.empty(len(guesses))
+        bounds = np.empty(len(guesses))
+        for batch in table.batches(guesses):
+            counts = table.hint_histograms(guesses[batch], targets)
+            entropies[batch] = EntropyGuesser.entropy_from_counts(counts, total)
+            counts[:, solved] = 0
+            bounds[batch] = total + LookaheadGuesser.lower_bounds(counts).sum(axis=1)
+
+        #highest entropy first, then words that are still possible, then
+        #alphabetical order
+        order = np.lexsort((np.arange(len(guesses)), ~self.mask[guesses], -entropies))
+        best, best_cost = None, bound
+        for i in order[:self.width]:
+            if self.out_of_nodes():
+                break
+            if bounds[i] >= best_cost:
+                continue
+            self.nodes += 1
+            cost = self.guess_cost(guesses[i], targets, plies, best_cost)
+            if cost < best_cost:
+                best, best_cost = guesses[i], cost
+        return best, best_cost
+
+    def guess_cost(self, guess, targets, plies, bound):
+        """Return the cost of solving targets starting with guess and
+        searching plies guesses deep, or infinity if it is at least bound or
+        the node budget runs out before it is known."""
+        table = WordleGuesser.get_hint_matrix()
+        codes = table.codes(np.array([guess]), targets)[0]
+        order = np.argsort(codes, kind='stable')
+        starts = np.flatnonzero(np.diff(codes[order], prepend=-1))
+        groups = [order[start:end] for start, end in zip(starts, list(starts[1:]) + [len(order)])
+                  if codes[order[start]] != table.num_hints - 1]
+
+        #largest groups first, so hopeless guesses are cut off early
+        groups.sort(key=len, reverse=True)
+        bounds = LookaheadGuesser.lower_bounds([len(group) for group in groups])
+        cost = float(len(targets))
+        rest = bounds.sum()
+        for group, group_bound in zip(groups, bounds):
+            rest -= group_bound
+            if len(group) <= 2:
+                cost += group_bound
+                continue
+            group_targets = targets[group]
+            group_guess, group_cost = self.search(group_targets, group_targets,
+                                                  plies - 1, bound - cost - rest)
+            cost += group_cost
+            if cost + rest >= bound or self.out_of_nodes():
+                return np.inf
+        return cost
+
+    ### METHODS FOR GUESSING ###
+
+    def best_guess(self):
+        """Return the guess in the guess pool with the lowest expected number
+        of guesses left, searching plies guesses deep within the node
+        budget."""
+        targets = self.candidate_indices()
+        guesses = self.guess_pool()
+        if len(targets) <= 2:
+            return WordleGuesser.word_list[targets[0]]
+
+        self.nodes = 0
+        guess, cost = self.search(guesses, targets, self.plies, np.inf)
+        if guess is None:
+            return EntropyGuesser.best_guess(self)
+        return WordleGuesser.word_list[guess]
+
+    def make_guess(self):
+        if len(self.words) == 0:
+            return None
+
+        self.guess_count += 1
+        if self.guess_count == 1 and EntropyGuesser.first_guess is not None:
+            self.guess = EntropyGuesser.first_guess
+        else:
+            self.guess = self.cached_guess(self.best_guess)
+        return self.guess
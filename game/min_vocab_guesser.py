@@ -10,30 +10,51 @@ average remaining vocab after its next guess.
 """
 
 from wordle_guesser import WordleGuesser
+import registry
+import hint_matrix
+import numpy as np
+import random
 
 class MinVocabGuesser(WordleGuesser):
     
     SMALL_GUESS_FILE = '../processed_data/small_voc.txt'
     LARGE_GUESS_FILE = '../processed_data/large_voc.txt'
+    first_guess = None
+    second_guesses = None
+    INSTRUMENTED = WordleGuesser.INSTRUMENTED + ('best_guess', 'score_guesses', 
+                                                'result_length', 'result_lengths')
+    compatibility_tables = dict()
+    
+    #hint spaces up to this size get one compatibility table per letter 
+    #pattern; for larger ones (longer words) only the hints that occur are
+    #compared
+    MAX_TABLE_HINTS = 729
+    
+    #number of guesses checked against the legacy filters per turn when 
+    #validating
+    VALIDATION_SAMPLE = 10
+    SEED = 'MinVocabGuesser'
     
     def set_early_guesses(guesses_file):
-        with open(guesses_file, 'r') as reader:
-            lines = reader.readlines()
+        MinVocabGuesser.first_guess, MinVocabGuesser.second_guesses = registry.get_opening_book(guesses_file)
+    
+    def __init__(self, set_vocab=True, small_vocab=True, set_guesses=True,
+                 batched=True, validate=False, config=None, hard_mode=False):
+        WordleGuesser.__init__(self, set_vocab, small_vocab, config, hard_mode)
         
-        first = lines[0]
-        MinVocabGuesser.first_guess = first.strip()
+        #score all candidate guesses at once instead of one word at a time
+        self.batched = batched
         
-        seconds = lines[1:]
-        MinVocabGuesser.second_guesses = dict()
-        for line in seconds:
-            items = line.split()
-            hint, guess = items[0], items[1]
-            MinVocabGuesser.second_guesses[hint] = guess
-            
-    def __init__(self, set_vocab=True, small_vocab=True, set_guesses=True):
-        WordleGuesser.__init__(self, set_vocab, small_vocab)
+        #check a sample of scores against _filtered_length on every turn
+        self.validate = validate
+        self.validation_random = random.Random(MinVocabGuesser.SEED)
         
-        if set_guesses == True:
+        if set_guesses == True and WordleGuesser.config.opening_books == False:
+            #there are no opening books for this game variant, so the first 
+            #two guesses are scored like the others
+            MinVocabGuesser.first_guess = None
+            MinVocabGuesser.second_guesses = None
+        elif set_guesses == True:
             if small_vocab == True:
                 guesses_file = MinVocabGuesser.SMALL_GUESS_FILE
             else:
@@ -73,26 +94,156 @@ class MinVocabGuesser(WordleGuesser):
                         words.remove(word)
     
     def _filtered_length(self, guess, target):
-        words = self.words.copy()
+        words = set(self.words)
         self._filter_by_position(guess, target, words)
         self._filter_by_count(guess, target, words)
         return len(words)
     
-    def result_length(self, guess):
+    def legacy_result_length(self, guess):
+        """Total remaining vocab after guess over all remaining targets, 
+        computed by filtering a copy of the remaining words for each target."""
         all_lengths = 0
         for target in self.words:
             all_lengths += self._filtered_length(guess, target)
         return all_lengths
     
+    def letter_pattern(guess):
+        """Return, for each position in guess, the first position holding the 
+        same letter (e.g. 'speed' gives (0, 1, 2, 2, 4))."""
+        return tuple(guess.index(letter) for letter in guess)
+    
+    def compatibility(pattern, codes=None):
+        """Return a table that is True at [a, b] when a word giving hint code b
+        survives _filter_by_position and _filter_by_count for a target giving 
+        hint code a, for guesses with the given letter pattern. If codes is 
+        given, the table only covers those hint codes; otherwise it covers
+        every code and is kept for later calls.
+        
+        Both filters only depend on the green positions and on how many copies
+        of each guessed letter a word has, which is exactly what a hint 
+        reveals, so _filtered_length is a lookup in this table."""
+        if codes is None and pattern in MinVocabGuesser.compatibility_tables:
+            return MinVocabGuesser.compatibility_tables[pattern]
+        
+        keep = codes is None
+        if keep == True:
+            codes = np.arange(3 ** len(pattern))
+        digits = hint_matrix.hint_digits(codes, len(pattern))
+        green = digits == hint_matrix.GREEN
+        
+        #filter by position: green positions must match exactly
+        table = (green[:, None, :] == green[None, :, :]).all(axis=2)
+        
+        #filter by count: if the target has at least as many copies of a 
+        #letter as the guess, words need at least that many; otherwise words 
+        #can have no more copies than the target
+        for first in sorted(set(pattern)):
+            positions = [i for i in range(len(pattern)) if pattern[i] == first]
+            found = (digits[:, positions] != hint_matrix.GRAY).sum(axis=1)
+            exact = (digits[:, positions] == hint_matrix.GRAY).any(axis=1)
+            table &= np.where(exact[:, None], 
+                              exact[None, :] & (found[None, :] <= found[:, None]),
+                              ~exact[None, :])
+        
+        #stored as floats so scoring uses fast matrix products; all sums are 
+        #integers far below 2 ** 53 so they stay exact
+        table = table.astype(np.float64)
+        if keep == True:
+            MinVocabGuesser.compatibility_tables[pattern] = table
+        return table
+    
+    def total_compatible(counts, pattern):
+        """Return counts @ table @ counts for each row of hint counts, where
+        table is the compatibility table of pattern."""
+        if counts.shape[1] <= MinVocabGuesser.MAX_TABLE_HINTS:
+            compatible = MinVocabGuesser.compatibility(pattern)
+        else:
+            codes = np.flatnonzero(counts.any(axis=0))
+            counts = counts[:, codes]
+            compatible = MinVocabGuesser.compatibility(pattern, codes)
+        return ((counts @ compatible) * counts).sum(axis=1)
+    
+    def result_length(self, guess):
+        counts = WordleGuesser.get_hint_matrix().hint_counts(
+            guess, self.candidate_indices())
+        counts = counts[None, :].astype(np.float64)
+        pattern = MinVocabGuesser.letter_pattern(guess)
+        return int(MinVocabGuesser.total_compatible(counts, pattern)[0])
+    
+    def result_lengths(self, guesses):
+        """Return result_length for each guess in guesses (an array of hint 
+        table indices) from one hint histogram per guess. If the hints 
+        partitioned the remaining words exactly this would be the sum of the 
+        squared partition sizes; the compatibility tables add the words the
+        legacy filters keep across partitions."""
+        table = WordleGuesser.get_hint_matrix()
+        targets = self.candidate_indices()
+        lengths = np.empty(len(guesses), dtype=np.int64)
+        for batch in table.batches(guesses):
+            counts = table.hint_histograms(guesses[batch], targets)
+            lengths[batch] = MinVocabGuesser.lengths_from_counts(guesses[batch], counts)
+        return lengths
+    
+    def lengths_from_counts(guesses, counts):
+        """Return result_length for each guess in guesses (an array of hint
+        table indices) given its hint histogram over the remaining words."""
+        table = WordleGuesser.get_hint_matrix()
+        counts = counts.astype(np.float64)
+        
+        #group guesses by letter pattern so each group shares one table
+        letters = table.letters[guesses]
+        patterns = np.argmax(letters[:, :, None] == letters[:, None, :], axis=1)
+        patterns, groups = np.unique(patterns, axis=0, return_inverse=True)
+        groups = groups.ravel()
+        
+        lengths = np.empty(len(guesses), dtype=np.int64)
+        for group in range(len(patterns)):
+            rows = groups == group
+            pattern = tuple(patterns[group].tolist())
+            lengths[rows] = MinVocabGuesser.total_compatible(counts[rows], pattern)
+        return lengths
+    
+    def score_guesses(self, guesses):
+        """Return a score for each guess in guesses (an array of vocabulary 
+        indices), where higher scores are better guesses."""
+        return -1 * self.result_lengths(guesses)
+    
+    def check_result_lengths(self, guesses, lengths):
+        """Check that a random sample of batched scores match the legacy 
+        filters, raising a RuntimeError naming the first guess that doesn't."""
+        table = WordleGuesser.get_hint_matrix()
+        sample = min(MinVocabGuesser.VALIDATION_SAMPLE, len(guesses))
+        for i in self.validation_random.sample(range(len(guesses)), sample):
+            guess = table.words[guesses[i]]
+            legacy = self.legacy_result_length(guess)
+            if lengths[i] != legacy:
+                raise RuntimeError(f'{guess}: batched score {lengths[i]}, legacy score {legacy}')
+    
+    def best_guess(self):
+        """Return the word in the guess pool that leaves the smallest total 
+        remaining vocab. Ties go to remaining words, then to the word that 
+        comes first alphabetically."""
+        if self.batched == True:
+            guesses = self.guess_pool()
+            lengths = self.result_lengths(guesses)
+            if self.validate == True:
+                self.check_result_lengths(guesses, lengths)
+            return self.best_scored(guesses, -1 * lengths)
+        words = [WordleGuesser.word_list[i] for i in self.guess_pool()]
+        return min(words, key=lambda x: (self.result_length(x), x not in self.words))
+    
     def make_guess(self):
         if len(self.words) == 0:
             return None
         
         self.guess_count += 1
-        if self.guess_count == 1:
+        if self.guess_count == 1 and MinVocabGuesser.first_guess is not None:
             self.guess = MinVocabGuesser.first_guess
-        elif self.guess_count == 2:
+        elif (self.guess_count == 2 and MinVocabGuesser.second_guesses is not None and 
+              self.hard_mode == False):
+            #the opening book only looks at the remaining possible words, so
+            #in hard mode the second guess is scored over the allowed guesses
             self.guess = MinVocabGuesser.second_guesses[self.hints]
         else:
-            self.guess = min(self.words, key=self.result_length)
+            self.guess = self.cached_guess(self.best_guess)
         return self.guess
\ No newline at end of file
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:13:55 2026
+
+This file contains the MultiBoardGuesser class, a subclass of WordleGuesser.
+MultiBoardGuesser plays multi-board variants of Wordle (Dordle, Quordle,
+Octordle), where each guess gets one hint for each of several boards, each
+with its own target word, and the game is won when every board is solved. The
+standard games allow five more guesses than there are boards.
+
+One mask of possible words is kept per board (self.mask is the union of
+them). A guess is scored by the sum of its entropies on the unsolved boards,
+computed for every guess and board at once from one block of hint codes per
+batch of guesses: the hint codes of the guesses against the possible words of
+every board, histogrammed per board. After each guess, every board is filtered
+with one row of the hint table, so boards are filtered to the words that give
+exactly the hint the board got. When a board has only one possible word left,
+that word is guessed.
+
+@author: Nora Goldfine
+"""
+
+import hashlib
+
+import numpy as np
+
+from wordle_guesser import WordleGuesser
+from entropy_guesser import EntropyGuesser
+from hint_matrix import hint_to_code
+
+class MultiBoardGuesser(WordleGuesser):
+
+    BOARDS = 4
+    INSTRUMENTED = WordleGuesser.INSTRUMENTED + ('best_guess', 'score_guesses',
+                                                'board_entropies')
+
+    def max_guesses(boards, config=None):
+        """Return the number of guesses allowed on boards boards: one more per
+        board than the single-board game (6 for Wordle, 7 for Dordle, 9 for
+        Quordle and 13 for Octordle)."""
+        config = config or WordleGuesser.config
+        return config.max_guesses + boards - 1
+
+    def __init__(self, set_vocab=True, small_vocab=True, config=None,
+                 hard_mode=False, boards=BOARDS):
+        if hard_mode == True:
+            raise ValueError('hard mode is not supported on multiple boards')
+        WordleGuesser.__init__(self, set_vocab, small_vocab, config)
+        self.boards = boards
+
+        #masks[b] is the mask over word_list of the possible words on board b
+        self.masks = np.ones((boards, len(WordleGuesser.word_list)), dtype=bool)
+        self.board_solved = np.zeros(boards, dtype=bool)
+        self.guess_count = 0
+
+    def reset(self):
+        WordleGuesser.reset(self)
+        self.masks[:] = True
+        self.board_solved[:] = False
+        self.guess_count = 0
+
+    def board_sizes(self):
+        """Return the number of possible words on each board."""
+        return self.masks.sum(axis=1)
+
+    def decision_key(self):
+        fingerprint = hashlib.blake2b(np.packbits(self.masks).tobytes(),
+                                      digest_size=16).digest()
+        return (type(self).__name__, WordleGuesser.vocab_key, self.boards,
+                fingerprint)
+
+    ### METHODS FOR GUESSING ###
+
+    def board_entropies(self, guesses):
+        """Return the entropy of each guess in guesses (an array of vocabulary
+        indices) on each unsolved board, with one row per guess and one
+        column per unsolved board."""
+        table = WordleGuesser.get_hint_matrix()
+        boards, targets = np.nonzero(self.masks[~self.board_solved])
+        num_boards = int((~self.board_solved).sum())
+        sizes = np.bincount(boards, minlength=num_boards)
+
+        entropies = np.empty((len(guesses), num_boards))
+        for batch in table.batches(guesses, num_boards):
+            counts = table.grouped_hint_histograms(guesses[batch], targets,
+                                                   boards, num_boards)
+            entropies[batch] = EntropyGuesser.entropy_from_counts(counts, sizes[:, None])
+        return entropies
+
+    def score_guesses(self, guesses):
+        """Return the total entropy of each guess in guesses (an array of 
+        vocabulary indices) over the unsolved boards."""
+        return self.board_entropies(guesses).sum(axis=1)
+
+    def best_guess(self):
+        """Return the possible word (on any board) with the highest total
+        entropy over the unsolved boards. Ties go to the word that comes
+        first alphabetically."""
+        guesses = self.candidate_indices()
+        return self.best_scored(guesses, self.score_guesses(guesses))
+
+    def make_guess(self):
+        if len(self.candidate_indices()) == 0:
+            return None
+
+        self.guess_count += 1
+        single = np.flatnonzero(self.board_sizes() == 1)
+        if len(single) > 0:
+            #guessing the last possible word on a board solves it
+            self.guess = WordleGuesser.word_list[np.flatnonzero(self.masks[single[0]])[0]]
+        else:
+            self.guess = self.cached_guess(self.best_guess)
+        return self.guess
+
+    ### METHODS FOR FILTERING POSSIBLE WORDS ###
+
+    def filt(self, hints):
+        """Filter the possible words on each board based on the hint it got
+        (hints is a list with one hint string per board, and None for boards
+        already solved). All boards are filtered with the hint codes of the
+        guess against the possible words of every board."""
+        self.hints = hints
+        table = WordleGuesser.get_hint_matrix()
+        candidates = self.candidate_indices()
+        guess = np.array([WordleGuesser.vocab.index[self.guess]])
+        codes = table.codes(guess, candidates)[0].astype(np.int64)
+        board_codes = np.array([-1 if hint is None else hint_to_code(hint)
+                                for hint in hints])
+
+        self.masks[:, candidates] &= codes[None, :] == board_codes[:, None]
+        solved = board_codes == table.num_hints - 1
+        self.board_solved |= solved
+        self.masks[solved] = False #no words left to guess on solved boards
+
+        self.mask[:] = self.masks.any(axis=0)
+        self.indices = None
+        self.solved = bool(self.board_solved.all())
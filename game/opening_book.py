@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:36:20 2026
+
+Builder for the opening books in the processed_data folder. An opening book
+holds a guesser's first guess over its whole vocabulary, followed by the second
+guess it makes after each hint the first guess can get (or a placeholder, if no
+words are left after the hint: "<NONE>" in the minimum vocabulary books and 
+"None" in the others). Guessers load these books with set_early_guesses instead
+of scoring the whole vocabulary on every game.
+
+Scoring is spread over a pool of worker processes: the vocabulary is split into
+chunks of candidate first guesses, and each hint is a separate second-guess
+task. Finished tasks are saved to a checkpoint file after each result, so an
+interrupted build picks up where it stopped when it is run again.
+
+Running this file rebuilds every opening book from the vocabularies in the
+raw_data folder.
+
+@author: Nora Goldfine
+"""
+
+import json
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from wordle_guesser import WordleGuesser
+from similarity_guesser import SimilarityGuesser
+from entropy_guesser import EntropyGuesser
+from min_vocab_guesser import MinVocabGuesser
+from hint_matrix import code_to_hint
+
+CHUNK_SIZE = 500
+WORKERS = os.cpu_count() or 1
+
+#placeholder written for hints that leave no words, as in the existing books
+NO_WORDS = 'None'
+STRATEGY_NO_WORDS = {'MinVocabGuesser' : '<NONE>'}
+
+#guesser used by each worker process
+_worker_guesser = None
+
+def _init_worker(guesser):
+    global _worker_guesser
+    _worker_guesser = guesser
+
+def _score_chunk(start):
+    """Return the best guess among CHUNK_SIZE vocabulary words from start,
+    with no hints given yet."""
+    _worker_guesser.reset()
+    guesses = np.arange(start, min(start + CHUNK_SIZE, len(WordleGuesser.word_list)))
+    scores = _worker_guesser.score_guesses(guesses)
+    best = int(np.argmax(scores))
+    return start, float(scores[best]), int(guesses[best])
+
+def _second_guess(task):
+    """Return the guess made after first_guess gets hint."""
+    first_guess, hint = task
+    if hint == WordleGuesser.GREEN * len(first_guess):
+        return hint, first_guess
+
+    _worker_guesser.reset()
+    _worker_guesser.guess = first_guess
+    _worker_guesser.filt(hint)
+    if len(_worker_guesser.words) == 0:
+        return hint, None
+    return hint, _worker_guesser.best_guess()
+
+class OpeningBookBuilder:
+
+    def __init__(self, guesser, book_file, checkpoint_file=None, workers=WORKERS):
+        self.guesser = guesser
+        self.book_file = book_file
+        self.checkpoint_file = checkpoint_file or book_file + '.checkpoint.json'
+        self.workers = workers
+        self.checkpoint = self.load_checkpoint()
+
+    def load_checkpoint(self):
+        checkpoint = {'strategy'   : type(self.guesser).__name__,
+                      'vocabulary' : WordleGuesser.vocab_key,
+                      'chunks'     : dict(),
+                      'first'      : None,
+                      'seconds'    : dict()}
+        if os.path.exists(self.checkpoint_file):
+            with open(self.checkpoint_file, 'r') as reader:
+                saved = json.load(reader)
+            if (saved['strategy'] != checkpoint['strategy'] or
+                saved['vocabulary'] != checkpoint['vocabulary']):
+                raise ValueError(f'{self.checkpoint_file} belongs to a different strategy or vocabulary')
+            checkpoint = saved
+        return checkpoint
+
+    def save_checkpoint(self):
+        temp_file = self.checkpoint_file + '.tmp'
+        with open(temp_file, 'w') as writer:
+            json.dump(self.checkpoint, writer)
+        os.replace(temp_file, self.checkpoint_file)
+
+    def run(self, pool, function, tasks):
+        """Run function on each task in pool, passing each result to
+        self.record and saving a checkpoint after each one."""
+        done = 0
+        start = time.time()
+        for result in pool.imap_unordered(function, tasks):
+            self.record(function, result)
+            self.save_checkpoint()
+            done += 1
+            if done % 10 == 0 or done == len(tasks):
+                print(f'{function.__name__}: {done}/{len(tasks)} tasks, {(time.time() - start) / 60} minutes')
+
+    def record(self, function, result):
+        if function is _score_chunk:
+            start, score, index = result
+            self.checkpoint['chunks'][str(start)] = [score, index]
+        else:
+            hint, guess = result
+            self.checkpoint['seconds'][hint] = guess
+
+    def first_guess(self):
+        """Return the best first guess over the completed chunks. Ties go to
+        the word that comes first alphabetically."""
+        best = max(self.checkpoint['chunks'].values(), key=lambda x: (x[0], -x[1]))
+        return WordleGuesser.word_list[best[1]]
+
+    def build(self):
+        context = multiprocessing.get_context('fork')
+        with context.Pool(self.workers, _init_worker, (self.guesser,)) as pool:
+
+            if self.checkpoint['first'] is None:
+                starts = [start for start in range(0, len(WordleGuesser.word_list), CHUNK_SIZE)
+                          if str(start) not in self.checkpoint['chunks']]
+                self.run(pool, _score_chunk, starts)
+                self.checkpoint['first'] = self.first_guess()
+                self.save_checkpoint()
+
+            first = self.checkpoint['first']
+            config = WordleGuesser.config
+            hints = [code_to_hint(code, config.word_length) 
+                     for code in range(config.num_hints)]
+            tasks = [(first, hint) for hint in hints
+                     if hint not in self.checkpoint['seconds']]
+            self.run(pool, _second_guess, tasks)
+
+        self.write_book(first, hints)
+        os.remove(self.checkpoint_file)
+
+    def write_book(self, first, hints):
+        no_words = STRATEGY_NO_WORDS.get(self.checkpoint['strategy'], NO_WORDS)
+        with open(self.book_file, 'w', newline='\r\n') as writer:
+            writer.write(f'{first}\n')
+            for hint in hints:
+                guess = self.checkpoint['seconds'][hint]
+                writer.write(f'{hint} {no_words if guess is None else guess}\n')
+
+def main():
+
+    guesser_types = [EntropyGuesser, SimilarityGuesser, MinVocabGuesser]
+
+    for small_vocab in [True, False]:
+        for guesser_type in guesser_types:
+            guesser = guesser_type(small_vocab=small_vocab, set_guesses=False)
+            if small_vocab == True:
+                book_file = guesser_type.SMALL_GUESS_FILE
+            else:
+                book_file = guesser_type.LARGE_GUESS_FILE
+            print(book_file.upper())
+            OpeningBookBuilder(guesser, book_file).build()
+
+if __name__ == '__main__':
+    main()
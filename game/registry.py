@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:49:21 2026
+
+Process-wide registry of vocabularies, opening books and the tables built from
+vocabularies (hint tables, filter indexes, letter counts). Each is loaded the
+first time it is asked for and then shared by every guesser in the process
+(and, through fork, by worker processes), so creating a guesser only costs a
+few lookups.
+
+Vocabularies and opening books are also cached on disk in parsed form, next to
+the other processed data. A cached copy is used as long as its source file has
+the same modification time and size (or, failing that, the same contents) as
+when it was parsed. Objects loaded from the same file are reloaded when the file
+changes.
+
+@author: Nora Goldfine
+"""
+
+import hashlib
+import os
+import pickle
+from types import MappingProxyType
+
+from game_config import WORDLE, ALPHABET
+from vocabulary import Vocabulary
+
+CACHE_DIR = '../processed_data'
+
+#bumped whenever the parsed form of a file changes
+CACHE_VERSION = 2
+
+#(absolute file path, variant) -> (stamp of the file, parsed contents)
+_files = dict()
+
+#(vocabulary key, name) -> object built from the vocabulary
+_shared = dict()
+
+def stamp(source_file):
+    stats = os.stat(source_file)
+    return (stats.st_mtime_ns, stats.st_size)
+
+def file_hash(source_file):
+    with open(source_file, 'rb') as reader:
+        return hashlib.sha1(reader.read()).hexdigest()
+
+def cache_file(source_file, variant='', cache_dir=CACHE_DIR):
+    name = os.path.basename(source_file)
+    if variant != '':
+        name += '.' + variant
+    return os.path.join(cache_dir, name + '.cache.pickle')
+
+def load_cached(source_file, parse, variant='', cache_dir=CACHE_DIR):
+    """Return parse(source_file), using the copy cached on disk if source_file
+    hasn't changed since it was made. Files parsed in more than one way are 
+    cached separately for each variant."""
+    cached = cache_file(source_file, variant, cache_dir)
+    source_stamp = stamp(source_file)
+    saved = None
+    if os.path.exists(cached):
+        try:
+            with open(cached, 'rb') as reader:
+                saved = pickle.load(reader)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            saved = None
+    if saved is not None and saved['version'] == CACHE_VERSION:
+        if saved['stamp'] == source_stamp:
+            return saved['value']
+        if saved['hash'] == file_hash(source_file):
+            saved['stamp'] = source_stamp
+            save_cached(saved, cached)
+            return saved['value']
+
+    saved = {'version' : CACHE_VERSION,
+             'stamp'   : source_stamp,
+             'hash'    : file_hash(source_file),
+             'value'   : parse(source_file)}
+    if os.path.isdir(cache_dir):
+        save_cached(saved, cached)
+    return saved['value']
+
+def save_cached(saved, cached):
+    #write to a temporary file first so an interrupted run never leaves a
+    #partial cache behind
+    temp_file = cached + '.tmp'
+    with open(temp_file, 'wb') as writer:
+        pickle.dump(saved, writer, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_file, cached)
+
+def get_file(source_file, parse, variant=''):
+    """Return the parsed contents of source_file, parsing it (or loading it
+    from the disk cache) only if it hasn't been loaded yet or has changed."""
+    key = (os.path.abspath(source_file), variant)
+    source_stamp = stamp(source_file)
+    if key not in _files or _files[key][0] != source_stamp:
+        _files[key] = (source_stamp, load_cached(source_file, parse, variant))
+    return _files[key][1]
+
+### METHODS FOR PARSING ###
+
+def read_vocabulary(vocab_file, config=WORDLE):
+    """Return a Vocabulary of the words in vocab_file that fit config."""
+    with open(vocab_file, 'r') as reader:
+        lines = reader.readlines()
+    return Vocabulary([x.strip() for x in lines if config.is_word(x.strip())],
+                      config.alphabet)
+
+def read_opening_book(book_file):
+    """Return the first guess of an opening book and a dictionary from each
+    hint to the second guess made after it."""
+    with open(book_file, 'r') as reader:
+        lines = reader.readlines()
+
+    first = lines[0].strip()
+    seconds = dict()
+    for line in lines[1:]:
+        items = line.split()
+        hint, guess = items[0], items[1]
+        seconds[hint] = guess
+    return first, seconds
+
+### METHODS FOR SHARED OBJECTS ###
+
+def get_vocabulary(vocab_file, config=WORDLE):
+    """Return the shared Vocabulary of the words in vocab_file that fit 
+    config (by default, the five-letter words)."""
+    variant = '' if config.word_length == 5 else str(config.word_length)
+    if config.alphabet != ALPHABET:
+        variant += '_' + hashlib.sha1(config.alphabet.encode('utf-8')).hexdigest()[:8]
+    return get_file(vocab_file, lambda x: read_vocabulary(x, config), variant)
+
+def get_opening_book(book_file):
+    """Return the first guess and a read-only dictionary of second guesses in
+    book_file."""
+    first, seconds = get_file(book_file, read_opening_book)
+    return first, MappingProxyType(seconds)
+
+def get_shared(vocabulary, name, build):
+    """Return the object called name built from vocabulary, calling
+    build(vocabulary) the first time it is asked for."""
+    key = (vocabulary.key, name)
+    if key not in _shared:
+        _shared[key] = build(vocabulary)
+    return _shared[key]
+
+def clear():
+    _files.clear()
+    _shared.clear()
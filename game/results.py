@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:39:48 2026
+
+This file contains the ResultsSink class, which writes WordleTester results as
+JSON lines: one record per game with the target, the guesses made, the hints
+given and the number of possible words left after each hint, followed by one
+summary record with the statistics of the whole test. Records are buffered and
+written in batches.
+
+With traces turned off, only the summary record is written.
+
+@author: Nora Goldfine
+"""
+
+import json
+
+class ResultsSink:
+    
+    BATCH_SIZE = 1000
+    
+    def __init__(self, writer, traces=True, batch_size=BATCH_SIZE):
+        self.writer = writer
+        self.traces = traces
+        self.batch_size = batch_size
+        self.buffer = []
+        
+    def record(self, target, guesses, hints, remaining, solved=None):
+        """Add the record of one game. For multi-board games, target is the
+        list of targets and solved says whether every board was solved."""
+        if self.traces == False:
+            return
+        if solved is None:
+            solved = guesses[-1] == target
+        game = {'target'    : target,
+                'guesses'   : guesses,
+                'hints'     : hints,
+                'remaining' : remaining,
+                'solved'    : solved}
+        self.buffer.append(json.dumps(game, separators=(',', ':')))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+            
+    def write_records(self, text):
+        """Write records already rendered as JSON lines (e.g. by a worker 
+        process)."""
+        self.flush()
+        self.writer.write(text)
+            
+    def summary(self, stats):
+        """Write the summary record."""
+        self.flush()
+        self.writer.write(json.dumps({'summary': stats}) + '\n')
+        
+    def flush(self):
+        if len(self.buffer) > 0:
+            self.writer.write('\n'.join(self.buffer) + '\n')
+            self.buffer = []
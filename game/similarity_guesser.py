@@ -6,34 +6,83 @@ This file contains the SimilarityGuesser class, a subclass of WordleGuesser.
 SimilarityGuesser selects the next guess for a Wordle puzzle by minimizing the 
 edit distance of its guess from all other possible guesses.
 
+Similarities are computed for all remaining words at once from two feature 
+arrays per word: the number of letters two words share is the number of 
+(letter, k) pairs where both words have at least k copies of the letter, and the
+number of positions they share is the number of (position, letter) pairs both
+have. Both are matrix products. With approximate set, similarities are 
+estimated from samples of the remaining words.
+
 @author: Nora Goldfine
 """
 
 from wordle_guesser import WordleGuesser
+import registry
+import numpy as np
 
 class SimilarityGuesser(WordleGuesser):
     
     SMALL_GUESS_FILE = '../processed_data/small_sim_guesses.txt'
     LARGE_GUESS_FILE = '../processed_data/large_sim_guesses.txt'
+    first_guess = None
+    second_guesses = None
+    INSTRUMENTED = WordleGuesser.INSTRUMENTED + ('best_guess', 'score_guesses', 
+                                                'global_similarity', 
+                                                'similarity_scores')
+    
+    #maximum number of (guess, target) similarities computed at once
+    BATCH_SIZE = 2 ** 20
+    
+    #similarities cost about the same per pair in samples and in batches
+    SAMPLING_COST = 1.3
     
     def set_early_guesses(guesses_file):
-        with open(guesses_file, 'r') as reader:
-            lines = reader.readlines()
-        
-        first = lines[0]
-        SimilarityGuesser.first_guess = first.strip()
+        SimilarityGuesser.first_guess, SimilarityGuesser.second_guesses = registry.get_opening_book(guesses_file)
+    
+    def compute_features(vocab):
+        """Return the quantity and position features of the words in 
+        vocab."""
+        counts = vocab.letter_counts
+        quantity = np.concatenate([counts >= k for k in range(1, counts.max() + 1)],
+                                  axis=1)
+        alphabet_size = counts.shape[1]
+        letters = vocab.letters + alphabet_size * np.arange(vocab.letters.shape[1])
+        position = np.zeros((len(vocab), alphabet_size * vocab.letters.shape[1]), 
+                            dtype=bool)
+        np.put_along_axis(position, letters, True, axis=1)
         
-        seconds = lines[1:]
-        SimilarityGuesser.second_guesses = dict()
-        for line in seconds:
-            items = line.split()
-            hint, guess = items[0], items[1]
-            SimilarityGuesser.second_guesses[hint] = guess
+        #stored as floats so similarities use fast matrix products; all sums
+        #are integers far below 2 ** 24 so they stay exact
+        return quantity.astype(np.float32), position.astype(np.float32)
+    
+    def get_features():
+        """Return the quantity and position features of the current 
+        vocabulary, computing them the first time they are needed."""
+        return registry.get_shared(WordleGuesser.vocab, 'similarity features', 
+                                   SimilarityGuesser.compute_features)
     
-    def __init__(self, set_vocab=True, small_vocab=True, set_guesses=True):
-        WordleGuesser.__init__(self, set_vocab, small_vocab)
+    def __init__(self, set_vocab=True, small_vocab=True, set_guesses=True,
+                 batched=True, config=None, hard_mode=False, approximate=False,
+                 sample_size=WordleGuesser.SAMPLE_SIZE, check_exact=False):
+        #only remaining words are guessed, and they always follow the hard 
+        #mode rules
+        WordleGuesser.__init__(self, set_vocab, small_vocab, config, hard_mode)
+        
+        #score all candidate guesses at once instead of one word at a time
+        self.batched = batched
         
-        if set_guesses == True:
+        #pick guesses by successive halving over samples of sample_size or 
+        #more remaining words (see WordleGuesser.halving_guess)
+        self.approximate = approximate
+        self.sample_size = sample_size
+        self.check_exact = check_exact
+        
+        if set_guesses == True and WordleGuesser.config.opening_books == False:
+            #there are no opening books for this game variant, so the first 
+            #two guesses are scored like the others
+            SimilarityGuesser.first_guess = None
+            SimilarityGuesser.second_guesses = None
+        elif set_guesses == True:
             if small_vocab == True:
                 guess_file = SimilarityGuesser.SMALL_GUESS_FILE
             else:
@@ -82,15 +131,56 @@ class SimilarityGuesser(WordleGuesser):
             score += self.word_similarity(guess, target)
         return score
     
+    def similarity_scores(self, guesses, targets=None):
+        """Return global_similarity for each guess in guesses (an array of 
+        vocabulary indices), comparing chunks of guesses with all targets (by
+        default, the remaining words) at once."""
+        quantity, position = SimilarityGuesser.get_features()
+        if targets is None:
+            targets = self.candidate_indices()
+        target_quantity = quantity[targets].T
+        target_position = position[targets].T
+        
+        scores = np.empty(len(guesses), dtype=np.int64)
+        chunk_size = max(1, SimilarityGuesser.BATCH_SIZE // max(1, len(targets)))
+        for start in range(0, len(guesses), chunk_size):
+            rows = guesses[start:start+chunk_size]
+            shared = quantity[rows] @ target_quantity
+            
+            #positions only count for words sharing at least one letter
+            placed = position[rows] @ target_position
+            placed *= shared > 0
+            scores[start:start+len(rows)] = (shared.sum(axis=1) + placed.sum(axis=1)).astype(np.int64)
+        return scores
+    
+    def score_guesses(self, guesses):
+        """Return a score for each guess in guesses (an array of vocabulary 
+        indices), where higher scores are better guesses."""
+        if self.batched == True:
+            return self.similarity_scores(guesses)
+        return np.array([self.global_similarity(WordleGuesser.word_list[i]) 
+                         for i in guesses])
+    
+    def best_guess(self):
+        """Return the remaining word most similar to all remaining words. Ties
+        go to the word that comes first alphabetically."""
+        if self.approximate == True:
+            return self.halving_guess(self.candidate_indices(), self.similarity_scores)
+        if self.batched == True:
+            guesses = self.candidate_indices()
+            scores = self.similarity_scores(guesses)
+            return WordleGuesser.word_list[guesses[np.argmax(scores)]]
+        return max(sorted(self.words), key=self.global_similarity)
+    
     def make_guess(self):
         if len(self.words) == 0:
             return None
         
         self.guess_count += 1
-        if self.guess_count == 1:
+        if self.guess_count == 1 and SimilarityGuesser.first_guess is not None:
             self.guess = SimilarityGuesser.first_guess
-        elif self.guess_count == 2:
+        elif self.guess_count == 2 and SimilarityGuesser.second_guesses is not None:
             self.guess = SimilarityGuesser.second_guesses[self.hints]
         else:
-            self.guess = max(self.words, key=self.global_similarity)
+            self.guess = self.cached_guess(self.best_guess)
         return self.guess
\ No newline at end of file
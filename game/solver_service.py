@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:45:31 2026
+
+This file contains the SolverService class, which solves many Wordle games at
+once. Each game is a session: create a session, ask it for a guess, give it the
+hint the guess got, and repeat until the word is found.
+
+All sessions share one guesser, along with the vocabulary, hint table and
+decision cache it uses. A session only keeps what differs between games: the
+remaining possible words (as a bit-packed mask over the vocabulary), the
+minimum letter counts learned so far, the allowed guesses (in hard mode) and 
+the last guess and hint. Before each
+step, the session's state is loaded into the shared guesser, and afterwards it
+is saved back.
+
+Guesses that need scoring (the third guess onwards) are computed in a pool of
+worker processes and stored in the decision cache, so the event loop stays free
+for other sessions and sessions that reach the same possible words share one
+scoring task. This relies on the decision cache; with caching turned off,
+scoring runs in the event loop.
+
+The service can be run over stdin/stdout or a local socket, with one command
+per line:
+    new                 ->  new <session>
+    guess <session>     ->  guess <session> <word>  (None if no words are left)
+    hint <session> <h>  ->  hint <session> <number of possible words left>
+    close <session>     ->  close <session>
+Errors are answered with "error <message>". Commands for different sessions
+are handled concurrently, so answers can arrive out of order, but the commands
+for each session are handled in the order they were sent.
+
+TreeGuesser is not supported, since its position in its tree is not part of a
+session.
+
+@author: Nora Goldfine
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+from wordle_guesser import WordleGuesser
+from similarity_guesser import SimilarityGuesser
+from entropy_guesser import EntropyGuesser
+from min_vocab_guesser import MinVocabGuesser
+
+WORKERS = os.cpu_count() or 1
+
+#guesser used by each worker process
+_worker_guesser = None
+
+def _init_worker(guesser):
+    global _worker_guesser
+    _worker_guesser = guesser
+
+def _best_guess(packed_mask, packed_allowed):
+    """Return the worker guesser's best guess when the words in packed_mask
+    remain and the words in packed_allowed can be guessed."""
+    _worker_guesser.reset()
+    _worker_guesser.mask = unpack_mask(packed_mask)
+    _worker_guesser.indices = None
+    _worker_guesser.allowed = unpack_mask(packed_allowed)
+    _worker_guesser.allowed_indices = None
+    return _worker_guesser.best_guess()
+
+def unpack_mask(packed_mask):
+    return np.unpackbits(packed_mask, count=len(WordleGuesser.word_list)).view(bool)
+
+class Session:
+
+    __slots__ = ('mask', 'allowed', 'min_counts', 'guess', 'hints', 
+                 'guess_count', 'solved')
+
+    def __init__(self, mask, allowed, guess_count):
+        self.mask = mask
+        self.allowed = allowed
+        self.min_counts = dict()
+        self.guess = None
+        self.hints = None
+        self.guess_count = guess_count
+        self.solved = False
+
+class SolverService:
+
+    def __init__(self, guesser, workers=WORKERS):
+        self.guesser = guesser
+        self.sessions = dict()
+        self.ids = itertools.count(1)
+
+        #every new session starts with this mask until its first hint
+        guesser.reset()
+        self.initial_mask = np.packbits(guesser.mask)
+        self.initial_mask.setflags(write=False)
+        self.initial_allowed = np.packbits(guesser.allowed)
+        self.initial_allowed.setflags(write=False)
+        self.initial_guess_count = guesser.__dict__.get('guess_count')
+
+        #guesses being scored in the worker pool, by decision key
+        self.scoring = dict()
+
+        self.pool = None
+        if workers > 0 and hasattr(guesser, 'best_guess'):
+            self.pool = ProcessPoolExecutor(workers, multiprocessing.get_context('fork'),
+                                            _init_worker, (guesser,))
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    ### METHODS FOR SESSION STATE ###
+
+    def load(self, session):
+        """Load session's state into the shared guesser."""
+        guesser = self.guesser
+        guesser.mask = unpack_mask(session.mask)
+        guesser.indices = None
+        guesser.allowed = unpack_mask(session.allowed)
+        guesser.allowed_indices = None
+        guesser.undo_stack = []
+        guesser.min_counts = defaultdict(lambda: 0, session.min_counts)
+        guesser.guess = session.guess
+        guesser.hints = session.hints
+        guesser.solved = session.solved
+        if session.guess_count is not None:
+            guesser.guess_count = session.guess_count
+
+    def save(self, session):
+        """Save the shared guesser's state into session."""
+        guesser = self.guesser
+        session.mask = np.packbits(guesser.mask)
+        session.allowed = np.packbits(guesser.allowed)
+        session.min_counts = dict(guesser.min_counts)
+        session.guess = guesser.guess
+        session.hints = guesser.hints
+        session.solved = guesser.solved
+        session.guess_count = guesser.__dict__.get('guess_count')
+
+    def get_session(self, session_id):
+        if session_id not in self.sessions:
+            raise KeyError(f'no session {session_id}')
+        return self.sessions[session_id]
+
+    ### METHODS FOR PLAYING ###
+
+    def create(self):
+        """Start a new game, returning its session id."""
+        session_id = next(self.ids)
+        self.sessions[session_id] = Session(self.initial_mask,
+                                            self.initial_allowed,
+                                            self.initial_guess_count)
+        return session_id
+
+    def close(self, session_id):
+        self.sessions.pop(session_id, None)
+
+    def needs_scoring(self, session):
+        """Return whether the session's next guess is scored rather than read
+        from an opening book. In hard mode only the first guess is read from
+        the book."""
+        first_scored = 1 if self.guesser.hard_mode == True else 2
+        return (self.pool is not None and session.guess_count is not None and
+                session.guess_count >= first_scored)
+
+    async def score(self, session):
+        """Make sure the decision cache holds the session's next guess,
+        scoring it in the worker pool if it doesn't."""
+        self.load(session)
+        if len(self.guesser.candidate_indices()) == 0:
+            return
+        key = self.guesser.decision_key()
+        if WordleGuesser.decision_cache.get(key) is not None:
+            return
+
+        if key not in self.scoring:
+            loop = asyncio.get_running_loop()
+            self.scoring[key] = loop.run_in_executor(self.pool, _best_guess,
+                                                     session.mask, 
+                                                     session.allowed)
+        future = self.scoring[key]
+        try:
+            guess = await future
+        finally:
+            self.scoring.pop(key, None)
+        WordleGuesser.decision_cache.put(key, guess)
+
+    async def next_guess(self, session_id):
+        """Return the next guess of a session, or None if no words are
+        left."""
+        session = self.get_session(session_id)
+        if self.needs_scoring(session):
+            await self.score(session)
+
+        self.load(session)
+        if len(self.guesser.candidate_indices()) == 0:
+            return None
+        guess = self.guesser.make_guess()
+        self.save(session)
+        return guess
+
+    def submit(self, session_id, hints):
+        """Filter a session's possible words by the hint its last guess got,
+        returning the number of possible words left."""
+        session = self.get_session(session_id)
+        if session.guess is None:
+            raise ValueError(f'session {session_id} has not guessed yet')
+        if (len(hints) != len(session.guess) or
+            any(x not in (WordleGuesser.GRAY, WordleGuesser.GOLD, WordleGuesser.GREEN) for x in hints)):
+            raise ValueError(f'invalid hint {hints}')
+
+        self.load(session)
+        self.guesser.filt(hints)
+        self.save(session)
+        return len(self.guesser.candidate_indices())
+
+    ### METHODS FOR SERVING ###
+
+    async def handle(self, line):
+        """Return the answer to one command line."""
+        items = line.split()
+        try:
+            if items == ['new']:
+                return f'new {self.create()}'
+            if len(items) < 2 or not items[1].isdigit():
+                raise ValueError(f'unknown command {line.strip()}')
+            command, session_id = items[0], int(items[1])
+            if command == 'guess' and len(items) == 2:
+                return f'guess {session_id} {await self.next_guess(session_id)}'
+            if command == 'hint' and len(items) == 3:
+                return f'hint {session_id} {self.submit(session_id, items[2])}'
+            if command == 'close' and len(items) == 2:
+                self.close(session_id)
+                return f'close {session_id}'
+            raise ValueError(f'unknown command {line.strip()}')
+        except (KeyError, ValueError) as e:
+            return f'error {e.args[0]}'
+
+    async def serve(self, reader, write):
+        """Answer each command line read from reader, passing answers to
+        write. Commands for the same session wait for the one before."""
+        pending = dict()
+
+        async def answer(line, previous):
+            if previous is not None:
+                await asyncio.wait([previous])
+            write(await self.handle(line) + '\n')
+
+        tasks = set()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            line = line.decode('ascii', 'replace')
+            if len(line.strip()) == 0:
+                continue
+            items = line.split()
+            session_id = items[1] if len(items) > 1 else None
+            task = asyncio.ensure_future(answer(line, pending.get(session_id)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            if session_id is not None:
+                pending[session_id] = task
+                task.add_done_callback(lambda t, s=session_id: pending.pop(s)
+                                       if pending.get(s) is t else None)
+        if len(tasks) > 0:
+            await asyncio.wait(tasks)
+
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader),
+                                     sys.stdin)
+
+        def write(text):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        await self.serve(reader, write)
+
+    async def serve_socket(self, path=None, port=None):
+        """Serve each connection to a Unix socket at path, or to port on
+        localhost."""
+        async def connection(reader, writer):
+            await self.serve(reader, lambda text: writer.write(text.encode('ascii')))
+            await writer.drain()
+            writer.close()
+
+        if path is not None:
+            server = await asyncio.start_unix_server(connection, path)
+        else:
+            server = await asyncio.start_server(connection, '127.0.0.1', port)
+        async with server:
+            await server.serve_forever()
+
+def main():
+    name2guesser = {'random'     : WordleGuesser,
+                    'entropy'    : EntropyGuesser,
+                    'similarity' : SimilarityGuesser,
+                    'minvocab'   : MinVocabGuesser}
+
+    parser = argparse.ArgumentParser(description='Serve Wordle solving sessions.')
+    parser.add_argument('--strategy', choices=list(name2guesser), default='entropy')
+    parser.add_argument('--large', action='store_true',
+                        help='guess from the large vocabulary')
+    parser.add_argument('--hard', action='store_true', help='play hard mode')
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--socket', help='path of a Unix socket to serve on')
+    parser.add_argument('--port', type=int, help='localhost port to serve on')
+    args = parser.parse_args()
+
+    guesser = name2guesser[args.strategy](small_vocab=not args.large, 
+                                          hard_mode=args.hard)
+    WordleGuesser.get_hint_matrix()
+    service = SolverService(guesser, args.workers)
+    try:
+        if args.socket is None and args.port is None:
+            asyncio.run(service.serve_stdio())
+        else:
+            asyncio.run(service.serve_socket(args.socket, args.port))
+    finally:
+        service.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -3,13 +3,14 @@
 Created on Sat Mar  5 18:35:56 2022
 
 Driver for testing WordleGuesser (and its subclasses SimilarityGuesser, 
-EntropyGuesser and MinVocabGuesser) using the WordleTester class.
+EntropyGuesser, MinVocabGuesser, LookaheadGuesser and EnsembleGuesser) using 
+the WordleTester class.
 
 Guessers are evaluated using two vocabularies. The smaller vocabulary is the set
 of all past and future official Wordle puzzle solutions. The larger vocabulary
 is the set of all words that are valid guesses in Wordle. For each guesser 
-(WordleGuesser, SimilarityGuesser, EntropyGuesser and MinVocabGuesser), three 
-experiments are run:
+(WordleGuesser, SimilarityGuesser, EntropyGuesser, MinVocabGuesser, 
+LookaheadGuesser and EnsembleGuesser), three experiments are run:
     1.  The guesser uses the SMALL vocabulary to solve puzzles, and each word
         in the SMALL vocabulary is a puzzle solution. Results are output to files
         ending in "small_small.txt"
@@ -20,62 +21,149 @@ experiments are run:
         in the LARGE vocabulary is a puzzle solution. Results are output to files
         ending in "large_large.txt"
 
+Each experiment is split across WORKERS worker processes. With EXACT set to 
+True, the deterministic guessers are instead evaluated exactly, by splitting the
+targets by hint after each guess (see WordleTester.test_exact).
+
+With RESULTS set to 'text', every game is written to the output file as text.
+With RESULTS set to 'jsonl', each game is recorded as one JSON line in a .jsonl
+file next to the output file, which then only holds the final statistics. With
+RESULTS set to 'summary', games aren't recorded at all.
+
+With INSTRUMENT set to True, the time spent in each guesser's make_guess, filt
+and scoring methods and the number of possible words at each turn are recorded
+and saved in a file ending in "_instrumentation.json" next to the output file.
+
+CONFIG (a GameConfig) chooses the game variant: the word length, alphabet,
+number of guesses allowed and the vocabulary files used for the experiments.
+
+With HARD_MODE set to True, the guessers play (and the tester enforces) hard 
+mode, and output files end in "_hard" (e.g. "entropy_small_small_hard.txt").
+
+With BOARDS set above 1, only the MultiBoardGuesser is tested, on multi-board 
+games with BOARDS targets each (2 for Dordle, 4 for Quordle, 8 for Octordle) 
+and the number of guesses those games allow. Output files start with 
+"multiboard" and end in the number of boards (e.g. 
+"multiboard_small_small_8boards.txt").
+
+With CHECKPOINT set to True, each test saves its progress every minute 
+(see WordleTester.CHECKPOINT_SECONDS) to a file ending in ".checkpoint.json" 
+next to its output file. Running the tests again picks up an interrupted test
+where its checkpoint left off, appending to its output files.
+
 @author: Nora Goldfine
 """
 
+import functools
+import json
 import os
 
+import registry
+
 from tester import WordleTester 
+from results import ResultsSink
+from instrumentation import Instrumentation
 from wordle_guesser import WordleGuesser 
+from game_config import WORDLE
 from similarity_guesser import SimilarityGuesser
 from entropy_guesser import EntropyGuesser
 from min_vocab_guesser import MinVocabGuesser
+from lookahead_guesser import LookaheadGuesser
+from ensemble_guesser import EnsembleGuesser
+from multi_board_guesser import MultiBoardGuesser
 
-LARGE_VOC_FILE = '../raw_data/wordle_vocab.txt' # full Wordle vocabulary
-SMALL_VOC_FILE = '../raw_data/wordle_wins.txt' # all past and future Wordle puzzle solutions
+LARGE_VOC_FILE = WORDLE.large_vocab_file # full Wordle vocabulary
+SMALL_VOC_FILE = WORDLE.small_vocab_file # all past and future Wordle puzzle solutions
+CONFIG = WORDLE
+WORKERS = os.cpu_count() or 1
+RESULTS = 'text'
+INSTRUMENT = False
+EXACT = False
+HARD_MODE = False
+BOARDS = 1
+CHECKPOINT = False
 
-def get_vocab(vocab_file):
-    with open(vocab_file, 'r') as reader:
-        lines = reader.readlines()
-    vocab = [x.strip() for x in lines if len(x.strip()) == 5]
-    return sorted(vocab)
+def get_vocab(vocab_file, config=WORDLE):
+    return list(registry.get_vocabulary(vocab_file, config).words)
 
 def test(guesser, vocab, output_file):
     print(output_file.upper())
-    with open(output_file, 'w') as writer:
-        t = WordleTester(guesser, vocab, writer)
-        t.test_guesser()
+    instrumentation = Instrumentation() if INSTRUMENT == True else None
+    exact = EXACT == True and type(guesser) is not WordleGuesser
+    max_guesses = MultiBoardGuesser.max_guesses(BOARDS, CONFIG)
+    
+    #an interrupted test appends to its output files from its checkpoint
+    checkpoint_file = None
+    mode = 'w'
+    if CHECKPOINT == True and exact == False:
+        checkpoint_file = os.path.splitext(output_file)[0] + '.checkpoint.json'
+        if os.path.exists(checkpoint_file):
+            mode = 'a'
+    
+    if RESULTS == 'text':
+        with open(output_file, mode) as writer:
+            t = WordleTester(guesser, vocab, writer, max_guesses, 
+                             workers=WORKERS, instrumentation=instrumentation, 
+                             exact=exact, hard_mode=HARD_MODE, boards=BOARDS,
+                             checkpoint_file=checkpoint_file)
+            t.test_guesser()
+    else:
+        records_file = os.path.splitext(output_file)[0] + '.jsonl'
+        with open(output_file, mode) as writer, open(records_file, mode) as records:
+            sink = ResultsSink(records, traces=(RESULTS == 'jsonl'))
+            t = WordleTester(guesser, vocab, writer, max_guesses, 
+                             workers=WORKERS, sink=sink,
+                             instrumentation=instrumentation, exact=exact,
+                             hard_mode=HARD_MODE, boards=BOARDS,
+                             checkpoint_file=checkpoint_file)
+            t.test_guesser()
+    
+    if instrumentation is not None:
+        instrumentation_file = os.path.splitext(output_file)[0] + '_instrumentation.json'
+        with open(instrumentation_file, 'w') as writer:
+            json.dump(instrumentation.summary(), writer, indent=2)
 
 def main():
     
-    small_vocab = get_vocab(SMALL_VOC_FILE)
-    large_vocab = get_vocab(LARGE_VOC_FILE)
+    small_vocab = get_vocab(CONFIG.small_vocab_file, CONFIG)
+    large_vocab = get_vocab(CONFIG.large_vocab_file, CONFIG)
     outloc = '../test_output'
+    suffix = '_hard' if HARD_MODE == True else ''
     
     name2guesser = {'random'     : WordleGuesser,
                     'entropy'    : EntropyGuesser,
                     'similarity' : SimilarityGuesser,
-                    'minvocab'   : MinVocabGuesser}
+                    'minvocab'   : MinVocabGuesser,
+                    'lookahead'  : LookaheadGuesser,
+                    'ensemble'   : EnsembleGuesser}
+    
+    if BOARDS > 1:
+        suffix = f'_{BOARDS}boards'
+        name2guesser = {'multiboard' : functools.partial(MultiBoardGuesser, 
+                                                         boards=BOARDS)}
     
     # guesses: small vocab, targets: small vocab
     for name in name2guesser:
         guesser_type = name2guesser[name]
-        out_file = os.path.join(outloc, name + '_small_small.txt')
-        guesser = guesser_type(small_vocab=True)
+        out_file = os.path.join(outloc, name + '_small_small' + suffix + '.txt')
+        guesser = guesser_type(small_vocab=True, config=CONFIG, 
+                               hard_mode=HARD_MODE)
         test(guesser, small_vocab, out_file)
     
     # guesses: large vocab, targets: small vocab
     for name in name2guesser:
         guesser_type = name2guesser[name]
-        out_file = os.path.join(outloc, name + '_large_small.txt')
-        guesser = guesser_type(small_vocab=False)
+        out_file = os.path.join(outloc, name + '_large_small' + suffix + '.txt')
+        guesser = guesser_type(small_vocab=False, config=CONFIG, 
+                               hard_mode=HARD_MODE)
         test(guesser, small_vocab, out_file)
         
     # guesses: large vocab, targets: large vocab
     for name in name2guesser:
         guesser_type = name2guesser[name]
-        out_file = os.path.join(outloc, name + '_large_large.txt')
-        guesser = guesser_type(small_vocab=False)
+        out_file = os.path.join(outloc, name + '_large_large' + suffix + '.txt')
+        guesser = guesser_type(small_vocab=False, config=CONFIG, 
+                               hard_mode=HARD_MODE)
         test(guesser, large_vocab, out_file)
 
 if __name__ == '__main__':
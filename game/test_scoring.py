@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:02:17 2026
+
+Tests for the shared scoring API (score_guesses, top_guesses) of guessers that
+combine several scores. Run from the game directory with pytest:
+    python -m pytest test_scoring.py
+
+@author: Nora Goldfine
+"""
+
+from wordle_guesser import WordleGuesser
+from ensemble_guesser import EnsembleGuesser
+from multi_board_guesser import MultiBoardGuesser
+
+def distinct_scores(guesser):
+    """Return the number of distinct scores among the guesser's top
+    guesses."""
+    return len(set(score for word, score in guesser.top_guesses(k=20)))
+
+def test_ensemble_top_guesses():
+    guesser = EnsembleGuesser(small_vocab=True)
+    WordleGuesser.get_hint_matrix()
+    assert distinct_scores(guesser) > 1
+
+    #after a hint, the top guess is the one best_guess picks
+    guesser.guess = 'raise'
+    guesser.filt('11211')
+    assert guesser.top_guesses(k=1)[0][0] == guesser.best_guess()
+    assert distinct_scores(guesser) > 1
+
+def test_multi_board_top_guesses():
+    guesser = MultiBoardGuesser(small_vocab=True, boards=4)
+    WordleGuesser.get_hint_matrix()
+    assert distinct_scores(guesser) > 1
+
+    guesser.guess = 'raise'
+    guesser.filt(['11211', '21111', '11113', '33111'])
+    assert guesser.top_guesses(k=1)[0][0] == guesser.best_guess()
+    assert distinct_scores(guesser) > 1
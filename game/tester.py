@@ -6,109 +6,376 @@ This file contains the WordleTester class, which tests the number of guesses
 a WordleGuesser takes to correctly guess each word in a vocabulary. Results of
 testing are written to an output file.
 
+Targets can be split into shards and tested in a pool of worker processes. Each
+worker tests its shards with its own copy of the guesser, and the output and 
+statistics of the shards are merged back in vocabulary order.
+
+Instead of the text output, results can be written to a ResultsSink as one
+JSON record per game (or only a summary record).
+
+Deterministic guessers can instead be evaluated exactly: targets are split by 
+the hint they give after each guess, so the guesser makes one guess per game 
+state instead of one per target per turn, and the results are the same as
+testing each target separately.
+
+In hard mode, each guess is checked against the hints the game's earlier 
+guesses got, and a guess that breaks the hard mode rules stops testing.
+
+With boards set above 1, a MultiBoardGuesser is tested on multi-board games
+instead: the vocabulary is shuffled (with a fixed seed) and split into games of
+one target per board, so every word is a target once (the last game is filled
+up with words from the first). Each turn, the hints for every board come from
+one row of the hint table.
+
+Long tests can be checkpointed: every CHECKPOINT_SECONDS, the statistics so far
+and the number of targets (or games) tested are saved to a checkpoint file,
+along with how much output had been written. A test started again with the 
+same checkpoint file cuts its output back to the checkpoint and carries on 
+from the next target. Progress is printed with the throughput and the time 
+left. Exact tests, which take seconds, are not checkpointed.
+
 @author: Nora Goldfine
 """
 
 from wordle_guesser import WordleGuesser
+from results import ResultsSink
+from hint_matrix import code_to_hint
 from collections import defaultdict 
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import random
 import time
 
+import numpy as np
+
+#tester used by each worker process in parallel testing
+_worker_tester = None
+
+def _init_worker(guesser, max_guesses, traces, instrumentation, hard_mode):
+    global _worker_tester
+    guesser.reset()
+    sink = None if traces is None else ResultsSink(None, traces)
+    if instrumentation is not None:
+        instrumentation.reset()
+    _worker_tester = WordleTester(guesser, [], None, max_guesses, sink=sink,
+                                  instrumentation=instrumentation, 
+                                  hard_mode=hard_mode)
+
+def _test_shard(targets):
+    """Test the worker's guesser on targets, returning the output written 
+    and the statistics collected."""
+    output = io.StringIO()
+    _worker_tester.writer = output
+    if _worker_tester.sink is not None:
+        _worker_tester.sink.writer = output
+    guess_counts, total_guesses, wins, win_guesses, failures = _worker_tester.test_targets(targets)
+    if _worker_tester.sink is not None:
+        _worker_tester.sink.flush()
+    instrumentation = _worker_tester.instrumentation
+    data = None
+    if instrumentation is not None:
+        data = instrumentation.export()
+        instrumentation.reset()
+    return (output.getvalue(), dict(guess_counts), total_guesses, wins, 
+            win_guesses, failures, data)
+
 class WordleTester:
     
-    WORD_LENGTH = 5
+    SHARD_SIZE = 50
+    SEED = 'WordleTester'
+    CHECKPOINT_SECONDS = 60
     
-    def __init__(self, guesser, vocab, writer, max_guesses=6):
+    def __init__(self, guesser, vocab, writer, max_guesses=6, workers=1, 
+                 sink=None, instrumentation=None, exact=False, hard_mode=False,
+                 boards=1, checkpoint_file=None):
         self.guesser = guesser
         self.vocab = sorted(vocab)
         self.writer = writer
         self.max_guesses = max_guesses
         
+        #if given, games are recorded in sink instead of written to writer,
+        #and writer (if not None) only gets the final statistics
+        self.sink = sink
+        
+        #number of worker processes used by test_guesser. Worker processes
+        #are forked, so they share the vocabulary and hint table already
+        #loaded in this process. Parallel results match a serial run: the
+        #random baseline is reseeded for each target (see seed_target), so 
+        #its game on a target doesn't depend on the worker or shard.
+        self.workers = workers
+        
+        #if True, test_guesser partitions the targets by hint instead of 
+        #testing each target separately. Only for deterministic guessers that
+        #support push and pop (not the random baseline or TreeGuesser).
+        self.exact = exact
+        
+        #if True, every guess must follow the hard mode rules
+        self.hard_mode = hard_mode
+        
+        #number of boards (target words) per game. Multi-board games are
+        #played serially by a MultiBoardGuesser with as many boards.
+        self.boards = boards
+        if boards > 1 and getattr(guesser, 'boards', 1) != boards:
+            raise ValueError(f'guesser does not play {boards} boards')
+        
+        #if given, the guesser's INSTRUMENTED methods are timed and the 
+        #possible words at each turn counted. Without it, testing runs the
+        #guesser's methods directly.
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.wrap(guesser)
+        
+        #if given, test_guesser saves its progress here and resumes from it.
+        #The writer (and the sink's writer) must be open for appending to the
+        #output of the interrupted test. Instrumentation only covers the 
+        #targets tested since the last resume.
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint = None
+        self.checkpoint_time = None
+    
+    ### METHODS FOR CHECKPOINTS ###
+    
+    def load_checkpoint(self):
+        """Return the checkpoint of an interrupted test of the same guesser
+        on the same targets, cutting the output back to what had been written
+        when it was saved, or a new checkpoint if there is none."""
+        checkpoint = {'strategy'    : type(self.guesser).__name__,
+                      'vocabulary'  : WordleGuesser.vocab_key,
+                      'targets'     : hashlib.sha1(' '.join(self.vocab).encode('utf-8')).hexdigest(),
+                      'max_guesses' : self.max_guesses,
+                      'hard_mode'   : self.hard_mode,
+                      'boards'      : self.boards,
+                      'done'        : 0,
+                      'guess_counts': dict(),
+                      'total_guesses' : 0,
+                      'wins'        : 0,
+                      'win_guesses' : 0,
+                      'failures'    : 0,
+                      'elapsed'     : 0.0,
+                      'output'      : 0,
+                      'records'     : 0}
+        if (self.checkpoint_file is None or self.exact == True or 
+            not os.path.exists(self.checkpoint_file)):
+            return checkpoint
+        
+        with open(self.checkpoint_file, 'r') as reader:
+            saved = json.load(reader)
+        for key in ('strategy', 'vocabulary', 'targets', 'max_guesses', 
+                    'hard_mode', 'boards'):
+            if saved[key] != checkpoint[key]:
+                raise ValueError(f'{self.checkpoint_file} belongs to a different test ({key})')
+        if self.writer is not None:
+            WordleTester.cut_output(self.writer, saved['output'])
+        if self.sink is not None and self.sink.writer is not None:
+            WordleTester.cut_output(self.sink.writer, saved['records'])
+        print(f'resuming from {self.checkpoint_file}: {saved["done"]} done')
+        return saved
+    
+    def cut_output(writer, size):
+        """Cut the output in writer back to its first size characters."""
+        if writer.seek(0, io.SEEK_END) < size:
+            raise ValueError('output is shorter than its checkpoint')
+        writer.seek(size)
+        writer.truncate()
+    
+    def sync_output(writer):
+        """Flush writer and, if it writes to a file, make sure the file is on
+        disk, so a checkpoint never counts output that was lost."""
+        writer.flush()
+        try:
+            os.fsync(writer.fileno())
+        except (io.UnsupportedOperation, AttributeError):
+            pass
+    
+    def resume(self):
+        """Return the number of targets (or games) already tested and the
+        statistics collected on them."""
+        checkpoint = self.checkpoint
+        guess_counts = defaultdict(lambda: 0)
+        for count in checkpoint['guess_counts']:
+            guess_counts[int(count)] = checkpoint['guess_counts'][count]
+        return (checkpoint['done'], guess_counts, checkpoint['total_guesses'],
+                checkpoint['wins'], checkpoint['win_guesses'], 
+                checkpoint['failures'])
+    
+    def save_checkpoint(self, done, guess_counts, total_guesses, wins, 
+                        win_guesses, failures, start):
+        """Save the statistics of the first done targets (or games) and the
+        size of the output written for them, if CHECKPOINT_SECONDS have passed
+        since the last save."""
+        if self.checkpoint_file is None:
+            return
+        now = time.time()
+        if now - self.checkpoint_time < WordleTester.CHECKPOINT_SECONDS:
+            return
+        self.checkpoint_time = now
+        
+        checkpoint = dict(self.checkpoint)
+        checkpoint['done'] = done
+        checkpoint['guess_counts'] = dict(guess_counts)
+        checkpoint['total_guesses'] = total_guesses
+        checkpoint['wins'] = wins
+        checkpoint['win_guesses'] = win_guesses
+        checkpoint['failures'] = failures
+        checkpoint['elapsed'] = self.checkpoint['elapsed'] + now - start
+        if self.writer is not None:
+            WordleTester.sync_output(self.writer)
+            checkpoint['output'] = self.writer.tell()
+        if self.sink is not None and self.sink.writer is not None:
+            self.sink.flush()
+            WordleTester.sync_output(self.sink.writer)
+            checkpoint['records'] = self.sink.writer.tell()
+        
+        #write to a temporary file first so an interrupted save never leaves
+        #a partial checkpoint behind
+        temp_file = self.checkpoint_file + '.tmp'
+        with open(temp_file, 'w') as writer:
+            json.dump(checkpoint, writer)
+        os.replace(temp_file, self.checkpoint_file)
+    
+    def report_progress(self, done, total, resumed, start, label):
+        """Print how many of total targets (or games) are done, how many are
+        tested per second since the test started (or resumed) and the 
+        estimated time left."""
+        elapsed = time.time() - start
+        rate = (done - resumed) / elapsed if elapsed > 0 else 0
+        left = (total - done) / rate if rate > 0 else float('inf')
+        print(f'{done}/{total} {label}: {elapsed / 60} minutes, {rate:.2f} per second, {left / 60:.2f} minutes left')
+        
+    def hard_mode_violation(guess, guesses, hints):
+        """Return how guess breaks the hard mode rules after guesses got 
+        hints, or None if it doesn't: each green letter must stay in place, 
+        and each letter must be used at least as many times as it was green 
+        or gold."""
+        for previous, hint in zip(guesses, hints):
+            revealed = defaultdict(lambda: 0)
+            for i in range(len(hint)):
+                if hint[i] == WordleGuesser.GREEN and guess[i] != previous[i]:
+                    return f'letter {i + 1} must be {previous[i]}'
+                if hint[i] != WordleGuesser.GRAY:
+                    revealed[previous[i]] += 1
+            for letter in revealed:
+                if guess.count(letter) < revealed[letter]:
+                    return f'{letter} must be used {revealed[letter]} time(s)'
+        return None
+    
+    def check_hard_mode(self, guess, guesses, hints):
+        if self.hard_mode == False or guess is None:
+            return
+        violation = WordleTester.hard_mode_violation(guess, guesses, hints)
+        if violation is not None:
+            raise Exception(f'ERROR -- Guess breaks hard mode rules: {guess} ({violation}); previous guesses: {guesses}')
+        
     def success(self, guess_counts, guesses, total_guesses, wins, win_guesses):
         guess_counts[guesses] += 1
         total_guesses += guesses
-        self.writer.write(f'\nguesses: {guesses}\n\n')
         if guesses <= self.max_guesses:
             wins += 1
             win_guesses += guesses
         return total_guesses, wins, win_guesses
     
-    def letter_count(self, word, letter):
-        count = 0
-        for x in word:
-            if x == letter:
-                count += 1
-        return count
-
-    def letter_matches(self, target, guess, letter, start_index):
-        count = 0
-        for i in range(start_index, len(guess)):
-            if guess[i] == letter and target[i] == letter:
-                count += 1
-        return count
+    def timed(self, name, function, *args):
+        """Return function(*args), timed under name if testing is 
+        instrumented."""
+        if self.instrumentation is None:
+            return function(*args)
+        size = len(self.guesser.candidate_indices())
+        start = time.perf_counter()
+        result = function(*args)
+        self.instrumentation.record(name, time.perf_counter() - start, size)
+        return result
     
     def try_again(self, guess, target):
-        feedback = [WordleGuesser.GRAY] * WordleTester.WORD_LENGTH
-        for i in range(len(guess)):
-            #print(f'guess[i]= {guess[i]} \t target[i]= {target[i]}')
-            if guess[i] == target[i]:
-                feedback[i] = WordleGuesser.GREEN
-        for i in range(len(guess)):
-            if feedback[i] != WordleGuesser.GREEN and guess[i] in target:
-                so_far = self.letter_count(guess[:i+1], guess[i])
-                later_threes = self.letter_matches(target, guess, guess[i], i+1)
-                confirmed = so_far + later_threes
-                if confirmed <= self.letter_count(target, guess[i]):
-                    feedback[i] = WordleGuesser.GOLD
-        self.writer.write(f'{feedback} ')
-        self.writer.flush()
-        hint = ''.join(feedback)
+        hint = self.timed('hint', WordleGuesser.get_hint_matrix().hint, guess, target)
         self.guesser.filt(hint)
-        self.writer.write(f'{len(self.guesser.words)}')
+        return hint
+    
+    def record_game(self, target, guesses, hints, remaining):
+        """Write one game to the sink, or as text to the writer. The text of 
+        each game is written in one piece once the game is over."""
+        if self.sink is not None:
+            self.sink.record(target, guesses, hints, remaining)
+            return
         
+        text = [f'target: {target}']
+        for i in range(len(guesses)):
+            text.append(f'\n\t{guesses[i]} ')
+            if i < len(hints):
+                text.append(f'{list(hints[i])} {remaining[i]}')
+        if guesses[-1] == target:
+            text.append(f'\nguesses: {len(guesses)}\n\n')
+        else:
+            text.append('\nUNABLE TO FIND WORD\n\n')
+        self.writer.write(''.join(text))
+        
+    def seed_target(target):
+        """Seed the random baseline's guesses from target (or, in a 
+        multi-board game, the list of targets), so each game is the same 
+        whichever games were played before it."""
+        if not isinstance(target, str):
+            target = ' '.join(target)
+        random.seed(f'{WordleGuesser.SEED} {target}')
+    
     def test_word(self, target, guess_counts, total_guesses, wins, win_guesses, 
                   total_failures):
-        self.writer.write(f'target: {target}')
         guessed = False
-        guesses = 0
+        guesses = []
+        hints = []
+        remaining = []
         guess = None
         
+        WordleTester.seed_target(target)
+        if self.instrumentation is not None:
+            self.instrumentation.count('games')
+        
         while not guessed:
-            guesses += 1
+            if self.instrumentation is not None:
+                self.instrumentation.observe_turn(len(guesses) + 1, 
+                                                  len(self.guesser.candidate_indices()))
             new_guess = self.guesser.make_guess()
             if new_guess == guess:
-                self.writer.write('\n\n')
-                self.writer.write(f'Scores: {self.guesser.scores}\n')
-                raise Exception(f'ERROR -- Guess the same as previous guess: {guess}; Solved guessers: {[x.is_solved() for x in self.guesser.guessers]}')
+                self.record_game(target, guesses, hints, remaining)
+                #an ensemble also reports its strategies' scores and states
+                guessers = getattr(self.guesser, 'guessers', [])
+                if self.writer is not None and hasattr(self.guesser, 'scores'):
+                    self.writer.write('\n\n')
+                    self.writer.write(f'Scores: {self.guesser.scores}\n')
+                raise Exception(f'ERROR -- Guess the same as previous guess: {guess}; Solved guessers: {[x.is_solved() for x in guessers]}')
             else:
                 guess = new_guess
-            self.writer.write(f'\n\t{guess} ')
+            self.check_hard_mode(guess, guesses, hints)
+            guesses.append(guess)
             
             if guess == target:
                 guessed = True
                 total_guesses, wins, win_guesses = self.success(guess_counts, 
-                                                                guesses, 
+                                                                len(guesses), 
                                                                 total_guesses, 
                                                                 wins, 
                                                                 win_guesses)
             
             elif guess == None:
-                self.writer.write('\nUNABLE TO FIND WORD\n\n')
                 total_failures += 1
                 guessed = True
                 
             else:
-                self.try_again(guess, target)
+                hints.append(self.try_again(guess, target))
+                remaining.append(len(self.guesser.words))
         
-        return total_guesses, wins, win_guesses
+        self.record_game(target, guesses, hints, remaining)
+        return total_guesses, wins, win_guesses, total_failures
             
     def display(self, guess_counts, total_guesses, voc_len, wins, win_guesses, 
                 elapsed, total_failures):
         for i in range(1, max(guess_counts)+1):
-            self.writer.write(f'guess count: {i} \t number of words {guess_counts[i]}\n')
+            self.writer.write(f'guess count: {i} \t number of words {guess_counts.get(i, 0)}\n')
         
         self.writer.write(f'\naverage guesses: {total_guesses / voc_len}\n\n')
         
-        self.writer.write(f'win rate (word found in 6 guesses or less): {wins / voc_len}\n')
+        self.writer.write(f'win rate (word found in {self.max_guesses} guesses or less): {wins / voc_len}\n')
         self.writer.write(f'average guesses on won games: {win_guesses / wins}\n\n')
         
         self.writer.write(f'vocabulary did not include solution {total_failures} times\n')
@@ -117,28 +384,284 @@ class WordleTester:
         self.writer.write(f'total guessing time: {elapsed/60} minutes\n')
         self.writer.write(f'time per word: {elapsed / voc_len} seconds')
             
-    def test_guesser(self):
+    def test_targets(self, targets):
+        """Test the guesser on each word in targets."""
         guess_counts = defaultdict(lambda: 0)
         wins = 0
         win_guesses = 0
         total_guesses = 0
         total_failures = 0
-        start = time.time()
         
-        for i in range(len(self.vocab)):
+        for target in targets:
+            total_guesses, wins, win_guesses, total_failures = self.test_word(target, 
+                                                                              guess_counts, 
+                                                                              total_guesses, 
+                                                                              wins, win_guesses, 
+                                                                              total_failures)
+            self.guesser.reset()
+        
+        return guess_counts, total_guesses, wins, win_guesses, total_failures
+    
+    ### METHODS FOR MULTI-BOARD GAMES ###
+    
+    def board_games(self):
+        """Return the vocabulary shuffled and split into games of one target
+        per board. The last game is filled up with the first targets."""
+        targets = list(self.vocab)
+        random.Random(WordleTester.SEED).shuffle(targets)
+        games = [targets[i:i+self.boards] 
+                 for i in range(0, len(targets), self.boards)]
+        if len(games) > 0 and len(games[-1]) < self.boards:
+            games[-1] += targets[:self.boards - len(games[-1])]
+        return games
+    
+    def record_boards(self, targets, guesses, hints, remaining, solved):
+        """Write one multi-board game to the sink, or as text to the 
+        writer. Hints and remaining hold one entry per board for each guess,
+        with None for the hints of boards already solved."""
+        if self.sink is not None:
+            self.sink.record(targets, guesses, hints, remaining, solved)
+            return
+        
+        text = [f'targets: {" ".join(targets)}']
+        for i in range(len(guesses)):
+            text.append(f'\n\t{guesses[i]} {hints[i]} {remaining[i]}')
+        if solved == True:
+            text.append(f'\nguesses: {len(guesses)}\n\n')
+        else:
+            text.append('\nUNABLE TO FIND WORDS\n\n')
+        self.writer.write(''.join(text))
+    
+    def play_boards(self, targets):
+        """Play one multi-board game with targets (one per board), returning
+        the number of guesses taken, or None if the guesser ran out of 
+        words."""
+        table = WordleGuesser.get_hint_matrix()
+        target_indices = np.array([table.index[target] for target in targets])
+        solved = np.zeros(len(targets), dtype=bool)
+        guesses = []
+        hints = []
+        remaining = []
+        guess = None
+        
+        WordleTester.seed_target(targets)
+        if self.instrumentation is not None:
+            self.instrumentation.count('games')
+        
+        while solved.all() == False:
+            if self.instrumentation is not None:
+                self.instrumentation.observe_turn(len(guesses) + 1, 
+                                                  len(self.guesser.candidate_indices()))
+            new_guess = self.guesser.make_guess()
+            if new_guess is None:
+                break
+            if new_guess == guess:
+                self.record_boards(targets, guesses, hints, remaining, False)
+                raise Exception(f'ERROR -- Guess the same as previous guess: {guess}')
+            guess = new_guess
+            guesses.append(guess)
+            
+            #the hints for every board from one row of the hint table
+            codes = self.timed('hint', table.codes, np.array([table.index[guess]]), 
+                               target_indices)[0]
+            turn_hints = [None if solved[i] == True else code_to_hint(int(codes[i]), len(guess))
+                          for i in range(len(targets))]
+            solved |= codes == table.num_hints - 1
+            self.guesser.filt(turn_hints)
+            hints.append(turn_hints)
+            remaining.append(self.guesser.board_sizes().tolist())
+        
+        self.record_boards(targets, guesses, hints, remaining, bool(solved.all()))
+        return len(guesses) if solved.all() == True else None
+    
+    def test_boards(self, start):
+        """Test the guesser on multi-board games covering the 
+        vocabulary."""
+        resumed, guess_counts, total_guesses, wins, win_guesses, total_failures = self.resume()
+        
+        self.guesser.reset()
+        games = self.board_games()
+        for i in range(resumed, len(games)):
+            self.save_checkpoint(i, guess_counts, total_guesses, wins, 
+                                 win_guesses, total_failures, start)
+            if i % 100 == 0:
+                self.report_progress(i, len(games), resumed, start, 
+                                     ' '.join(games[i]))
+            guesses = self.play_boards(games[i])
+            if guesses is None:
+                total_failures += 1
+            else:
+                total_guesses, wins, win_guesses = self.success(guess_counts, 
+                                                                guesses, 
+                                                                total_guesses, 
+                                                                wins, 
+                                                                win_guesses)
+            self.guesser.reset()
+        
+        return guess_counts, total_guesses, wins, win_guesses, total_failures
+    
+    def test_exact(self):
+        """Test the guesser on the vocabulary by following every game at 
+        once, making one guess per distinct game state. Games are recorded in
+        vocabulary order, as in a serial test."""
+        guess_counts = defaultdict(lambda: 0)
+        games = dict()
+        if self.instrumentation is not None:
+            self.instrumentation.count('games', len(self.vocab))
+        
+        self.guesser.reset()
+        failures = self.partition(self.vocab, [], [], [], guess_counts, games)
+        self.guesser.reset()
+        
+        if self.sink is None or self.sink.traces == True:
+            for target in self.vocab:
+                self.record_game(target, *games[target])
+        
+        total_guesses = sum(turn * guess_counts[turn] for turn in guess_counts)
+        wins = sum(guess_counts[turn] for turn in guess_counts 
+                   if turn <= self.max_guesses)
+        win_guesses = sum(turn * guess_counts[turn] for turn in guess_counts 
+                          if turn <= self.max_guesses)
+        return guess_counts, total_guesses, wins, win_guesses, failures
+    
+    def partition(self, targets, guesses, hints, remaining, guess_counts, games):
+        """Play the guesser's next guess for all targets, which all reach the
+        guesser's current state after guesses and hints, then split the 
+        targets by hint and continue each group. Return the number of targets
+        the guesser ran out of words for."""
+        if self.instrumentation is not None:
+            self.instrumentation.observe_turn(len(guesses) + 1, 
+                                              len(self.guesser.candidate_indices()),
+                                              len(targets))
+        guess = self.guesser.make_guess()
+        if len(guesses) > 0 and guess == guesses[-1]:
+            raise Exception(f'ERROR -- Guess the same as previous guess: {guess}')
+        self.check_hard_mode(guess, guesses, hints)
+        guesses = guesses + [guess]
+        
+        if guess is None:
+            for target in targets:
+                games[target] = (guesses, hints, remaining)
+            return len(targets)
+        
+        table = WordleGuesser.get_hint_matrix()
+        groups = dict()
+        for target in targets:
+            if target == guess:
+                guess_counts[len(guesses)] += 1
+                games[target] = (guesses, hints, remaining)
+            else:
+                groups.setdefault(self.timed('hint', table.hint, guess, target), []).append(target)
+        
+        failures = 0
+        for hint in sorted(groups):
+            self.guesser.push(guess, hint)
+            failures += self.partition(groups[hint], guesses, hints + [hint],
+                                       remaining + [len(self.guesser.words)],
+                                       guess_counts, games)
+            self.guesser.pop()
+        return failures
+    
+    def test_parallel(self, start):
+        """Test the guesser on the vocabulary in a pool of worker processes,
+        writing the output of each shard in vocabulary order."""
+        resumed, guess_counts, total_guesses, wins, win_guesses, failures = self.resume()
+        
+        shards = [self.vocab[i:i+WordleTester.SHARD_SIZE] 
+                  for i in range(resumed, len(self.vocab), WordleTester.SHARD_SIZE)]
+        context = multiprocessing.get_context('fork')
+        traces = None if self.sink is None else self.sink.traces
+        with context.Pool(self.workers, _init_worker, 
+                          (self.guesser, self.max_guesses, traces, 
+                           self.instrumentation, self.hard_mode)) as pool:
+            done = resumed
+            for result in pool.imap(_test_shard, shards):
+                text, shard_counts, shard_guesses, shard_wins, shard_win_guesses, shard_failures, data = result
+                if self.sink is not None:
+                    self.sink.write_records(text)
+                else:
+                    self.writer.write(text)
+                for count in shard_counts:
+                    guess_counts[count] += shard_counts[count]
+                total_guesses += shard_guesses
+                wins += shard_wins
+                win_guesses += shard_win_guesses
+                failures += shard_failures
+                if data is not None:
+                    self.instrumentation.merge(data)
+                
+                done = min(done + WordleTester.SHARD_SIZE, len(self.vocab))
+                self.save_checkpoint(done, guess_counts, total_guesses, wins,
+                                     win_guesses, failures, start)
+                if (done - resumed) % 500 == 0 or done == len(self.vocab):
+                    self.report_progress(done, len(self.vocab), resumed, start,
+                                         self.vocab[done - 1])
+        
+        return guess_counts, total_guesses, wins, win_guesses, failures
+    
+    def test_serial(self, start):
+        """Test the guesser on the vocabulary, one target after another."""
+        resumed, guess_counts, total_guesses, wins, win_guesses, failures = self.resume()
+        
+        for i in range(resumed, len(self.vocab)):
             target = self.vocab[i]
+            self.save_checkpoint(i, guess_counts, total_guesses, wins, 
+                                 win_guesses, failures, start)
             if i % 100 == 0:
-                now = time.time()
-                print(f'{i} {target}: {(now - start) / 60} minutes')
-            total_guesses, wins, win_guesses = self.test_word(target, 
-                                                              guess_counts, 
-                                                              total_guesses, 
-                                                              wins, win_guesses, 
-                                                              total_failures)
+                self.report_progress(i, len(self.vocab), resumed, start, target)
+            total_guesses, wins, win_guesses, failures = self.test_word(target, 
+                                                                        guess_counts, 
+                                                                        total_guesses, 
+                                                                        wins, win_guesses, 
+                                                                        failures)
             self.guesser.reset()
+        
+        return guess_counts, total_guesses, wins, win_guesses, failures
+            
+    def test_guesser(self):
+        start = time.time()
+        self.checkpoint = self.load_checkpoint()
+        self.checkpoint_time = start
+        
+        #number of games played: one per target, or one per group of targets
+        #in multi-board games
+        played = len(self.vocab)
+        
+        if self.boards > 1:
+            guess_counts, total_guesses, wins, win_guesses, total_failures = self.test_boards(start)
+            played = len(self.board_games())
+        
+        elif self.exact == True:
+            guess_counts, total_guesses, wins, win_guesses, total_failures = self.test_exact()
+        
+        elif self.workers > 1:
+            guess_counts, total_guesses, wins, win_guesses, total_failures = self.test_parallel(start)
+        
+        else:
+            guess_counts, total_guesses, wins, win_guesses, total_failures = self.test_serial(start)
             
         end = time.time()
-        elapsed = end - start
+        elapsed = self.checkpoint['elapsed'] + end - start
+        
+        if (self.checkpoint_file is not None and self.exact == False and 
+            os.path.exists(self.checkpoint_file)):
+            os.remove(self.checkpoint_file)
+        
+        if self.instrumentation is not None:
+            print(self.instrumentation.report())
         
-        self.display(guess_counts, total_guesses, len(self.vocab), wins, 
-                     win_guesses, elapsed, total_failures)
\ No newline at end of file
+        if self.writer is not None:
+            self.display(guess_counts, total_guesses, played, wins, 
+                         win_guesses, elapsed, total_failures)
+        if self.sink is not None:
+            voc_len = played
+            stats = {'guess counts'     : dict(sorted(guess_counts.items())),
+                     'average guesses'  : total_guesses / voc_len,
+                     'win rate'         : wins / voc_len,
+                     'average win guesses' : win_guesses / wins if wins > 0 else None,
+                     'failures'         : total_failures,
+                     'elapsed seconds'  : elapsed,
+                     'seconds per word' : elapsed / voc_len}
+            if self.instrumentation is not None:
+                stats['instrumentation'] = self.instrumentation.summary()
+            self.sink.summary(stats)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:33:21 2026
+
+This file contains the TreeGuesser class, a subclass of WordleGuesser. 
+TreeGuesser replays a decision tree compiled from another guesser by 
+decision_tree.py, so each guess is a dictionary lookup of the last hint.
+
+If a hint leads off the tree (the target was not in the vocabulary the tree was
+compiled for), TreeGuesser falls back to guessing randomly like WordleGuesser.
+
+@author: Nora Goldfine
+"""
+
+from wordle_guesser import WordleGuesser
+from decision_tree import load_tree
+
+class TreeGuesser(WordleGuesser):
+    
+    def set_tree(tree_file):
+        data = load_tree(tree_file)
+        if data['vocabulary'] != WordleGuesser.vocab_key:
+            raise ValueError(f'{tree_file} was compiled for a different vocabulary')
+        TreeGuesser.strategy = data['strategy']
+        TreeGuesser.tree = data['tree']
+    
+    def __init__(self, tree_file, set_vocab=True, small_vocab=True):
+        WordleGuesser.__init__(self, set_vocab, small_vocab)
+        TreeGuesser.set_tree(tree_file)
+        self.node = TreeGuesser.tree
+        
+    def reset(self):
+        WordleGuesser.reset(self)
+        self.node = TreeGuesser.tree
+        
+    ### METHODS FOR GUESSING ###
+    
+    def make_guess(self):
+        if len(self.words) == 0:
+            return None
+        
+        if self.node is None:
+            return WordleGuesser.make_guess(self)
+        self.guess = self.node['guess']
+        return self.guess
+    
+    def filt(self, hints):
+        WordleGuesser.filt(self, hints)
+        if self.node is not None:
+            self.node = self.node.get('next', {}).get(hints)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:37:38 2026
+
+This file contains the Vocabulary class, a compact read-only vocabulary shared
+by all guessers (and, through fork, by all worker processes). Words are stored
+in sorted order as an array of letter indices with one row per word, next to an
+array of how many times each letter of the alphabet appears in each word.
+
+It also contains CandidateWords, a read-only set-like view of the words
+selected by a guesser's candidate mask, and LetterCounts, which gives the
+letter counts of words in the word -> letter -> count form the scoring methods
+use.
+
+@author: Nora Goldfine
+"""
+
+from collections import Counter
+import hashlib
+
+import numpy as np
+
+from game_config import ALPHABET
+from hint_matrix import encode_words, count_letters
+
+class Vocabulary:
+
+    def __init__(self, words, alphabet=ALPHABET):
+        self.words = tuple(sorted(set(words)))
+        self.index = {word: i for i, word in enumerate(self.words)}
+        self.alphabet = alphabet
+        
+        self.letters = encode_words(self.words, alphabet)
+        self.letters.setflags(write=False)
+        self.letter_counts = count_letters(self.letters, len(alphabet))
+        self.letter_counts.setflags(write=False)
+        self.word_length = self.letters.shape[1]
+        
+        #identifies the vocabulary in file names and caches. Letters are 
+        #numbered by their place in the alphabet, so other alphabets are part
+        #of the key.
+        text = ' '.join(self.words)
+        if alphabet != ALPHABET:
+            text = alphabet + '\n' + text
+        self.key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def __setstate__(self, state):
+        #arrays come back writable from a pickle (e.g. the registry's disk 
+        #cache)
+        self.__dict__.update(state)
+        self.letters.setflags(write=False)
+        self.letter_counts.setflags(write=False)
+    
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __contains__(self, word):
+        return word in self.index
+
+class CandidateWords:
+
+    def __init__(self, vocabulary, mask):
+        self.vocabulary = vocabulary
+        self.mask = mask
+
+    def __len__(self):
+        return int(np.count_nonzero(self.mask))
+
+    def __iter__(self):
+        words = self.vocabulary.words
+        return (words[i] for i in np.flatnonzero(self.mask))
+
+    def __contains__(self, word):
+        i = self.vocabulary.index.get(word)
+        return i is not None and bool(self.mask[i])
+
+    def __eq__(self, other):
+        return set(self) == set(other)
+
+    def __repr__(self):
+        return f'CandidateWords({set(self)})'
+
+class LetterCounts(dict):
+    """Maps each word to a Counter of its letters, built the first time the
+    word is looked up. Letters a word doesn't have count as 0."""
+
+    def __missing__(self, word):
+        self[word] = Counter(word)
+        return self[word]
@@ -6,42 +6,122 @@ This file contains the WordleGuesser class, solves Wordle puzzles. WordleGuesser
 randomly selects a guess from its vocabulary, and filters remaining possible 
 guesses based on the letter-color feedback ("hints") a Wordle puzzle provides.  
 
+In hard mode, every guess must keep the green letters revealed so far in place
+and use every revealed gold letter. Guessers that score guesses can then guess
+any word in the vocabulary that follows those rules (not just the remaining 
+possible words); the allowed words are kept as a mask that each hint narrows.
+
+Guessers that score guesses can also estimate scores from random samples of the
+remaining words (see halving_guess), so turns with thousands of remaining words
+cost time in proportion to the sample size.
+
 @author: Nora Goldfine
 """
 
 from collections import defaultdict
+import hashlib
 import random
 
+import numpy as np
+
+import registry
+from decision_cache import DecisionCache
+from filter_index import FilterIndex
+from game_config import WORDLE
+from hint_matrix import HintMatrix
+from vocabulary import CandidateWords, LetterCounts
+
 class WordleGuesser:
     
     GRAY = '1'
     GOLD = '2'
     GREEN = '3'
-    LARGE_VOC_FILE = '../raw_data/wordle_vocab.txt'
-    SMALL_VOC_FILE = '../raw_data/wordle_wins.txt'
+    LARGE_VOC_FILE = WORDLE.large_vocab_file
+    SMALL_VOC_FILE = WORDLE.small_vocab_file
     SEED = 'WordleGuesser'
+    DECISION_CACHE_SIZE = 100000
+    
+    #successive halving: size of the first sample of remaining words, 
+    #fraction of guesses kept after each round, number of guesses that are
+    #always scored in full, and the largest sample any round scores
+    SAMPLE_SIZE = 256
+    KEEP = 0.5
+    MIN_SURVIVORS = 8
+    MAX_SAMPLE = 4096
+    
+    #how many times more a guess-word pair costs to score in a sampled round
+    #than in one exact call (sampling, sorting and the calls themselves);
+    #turns that halving would not make cheaper are scored exactly
+    SAMPLING_COST = 2.0
+    
+    #methods timed by Instrumentation.wrap
+    INSTRUMENTED = ('make_guess', 'filt')
+    
+    config = WORDLE
+    hint_matrix = None
+    decision_cache = DecisionCache(DECISION_CACHE_SIZE)
+    
+    def set_config(config):
+        """Play the game variant described by config (a GameConfig) from now 
+        on. Vocabularies set afterwards are read with config's word length and
+        alphabet."""
+        WordleGuesser.config = config
     
     def set_vocabulary(vocab_file):
-        with open(vocab_file, 'r') as reader:
-            lines = reader.readlines()
-        vocab = [x.strip() for x in lines if len(x.strip()) == 5]
-        WordleGuesser.vocab = set(vocab)
+        WordleGuesser.vocab = registry.get_vocabulary(vocab_file, WordleGuesser.config)
+        WordleGuesser.word_list = WordleGuesser.vocab.words
+        WordleGuesser.vocab_key = WordleGuesser.vocab.key
+        WordleGuesser.hint_matrix = None
+        
+    def get_hint_matrix():
+        """Return the hint table for the current vocabulary, loading it the 
+        first time it is needed."""
+        if WordleGuesser.hint_matrix is None:
+            WordleGuesser.hint_matrix = registry.get_shared(WordleGuesser.vocab, 
+                                                            'hint matrix', 
+                                                            HintMatrix)
+        return WordleGuesser.hint_matrix
+        
+    def set_decision_cache(max_entries):
+        """Replace the decision cache shared by all guessers with an empty one
+        holding at most max_entries guesses (0 turns caching off)."""
+        WordleGuesser.decision_cache = DecisionCache(max_entries)
         
     def set_letter_counts():
-        WordleGuesser.letter_counts = defaultdict(lambda: defaultdict(lambda: 0))
-        for word in WordleGuesser.vocab:
-            for letter in word:
-                WordleGuesser.letter_counts[word][letter] += 1
+        WordleGuesser.letter_counts = registry.get_shared(WordleGuesser.vocab, 
+                                                          'letter counts', 
+                                                          lambda vocab: LetterCounts())
+                
+    def set_filter_index():
+        WordleGuesser.filter_index = registry.get_shared(WordleGuesser.vocab, 
+                                                         'filter index', 
+                                                         FilterIndex)
     
-    def __init__(self, set_vocab=True, small_vocab=True):
+    def __init__(self, set_vocab=True, small_vocab=True, config=None, 
+                 hard_mode=False):
         
-        #get initial vocabulary
+        #get game variant and initial vocabulary
+        if config is not None:
+            WordleGuesser.set_config(config)
         if set_vocab == True:
-            vocab_file = WordleGuesser.SMALL_VOC_FILE if small_vocab == True else WordleGuesser.LARGE_VOC_FILE
+            vocab_file = WordleGuesser.config.vocab_file(small_vocab)
             WordleGuesser.set_vocabulary(vocab_file)
             WordleGuesser.set_letter_counts()
-        self.words = WordleGuesser.vocab.copy()
-        self.letter_counts = WordleGuesser.letter_counts.copy()
+            WordleGuesser.set_filter_index()
+        self.letter_counts = WordleGuesser.letter_counts
+        
+        #mask over word_list of the remaining possible guesses
+        self.mask = np.ones(len(WordleGuesser.word_list), dtype=bool)
+        self.indices = None
+        
+        #in hard mode, mask over word_list of the words that are allowed 
+        #guesses given the hints so far
+        self.hard_mode = hard_mode
+        self.allowed = np.ones(len(WordleGuesser.word_list), dtype=bool)
+        self.allowed_indices = None
+        
+        #changes made by push, most recent last, so pop can undo them
+        self.undo_stack = []
         
         #minimum number of times letter must occur in target word
         self.min_counts = defaultdict(lambda: 0)
@@ -50,24 +130,200 @@ class WordleGuesser:
         #using hint '33333')
         self.solved = False 
         
+        #if True, guessers that score guesses pick them by successive halving
+        #over samples of the remaining words instead of scoring them exactly.
+        #Larger samples make the picks closer to exact scoring.
+        self.approximate = False
+        self.sample_size = WordleGuesser.SAMPLE_SIZE
+        
+        #if True, each sampled pick is compared with the exact best guess, and
+        #the number of picks that differ is counted in sampling_stats
+        self.check_exact = False
+        self.sampling_stats = {'sampled turns'  : 0, 
+                               'exact turns'    : 0, 
+                               'fewest sampled' : None, 
+                               'most sampled'   : None, 
+                               'disagreements'  : 0, 
+                               'score lost'     : 0.0}
+        
         #set random seed for random guessing
         random.seed(WordleGuesser.SEED)
     
     def reset(self):
-        self.words = WordleGuesser.vocab.copy()
-        self.letter_counts = WordleGuesser.letter_counts.copy()
+        self.mask[:] = True
+        self.indices = None
+        self.allowed[:] = True
+        self.allowed_indices = None
+        self.undo_stack = []
         self.min_counts = defaultdict(lambda: 0)
         self.solved = False
         
     def is_solved(self):
         return self.solved
     
+    @property
+    def words(self):
+        """The remaining possible guesses, as a read-only view of self.mask."""
+        return CandidateWords(WordleGuesser.vocab, self.mask)
+    
+    @words.setter
+    def words(self, words):
+        self.mask = np.zeros(len(WordleGuesser.word_list), dtype=bool)
+        self.mask[[WordleGuesser.vocab.index[word] for word in words]] = True
+        self.indices = None
+    
+    def candidate_indices(self):
+        """Return the hint table indices of the remaining possible guesses."""
+        if self.indices is None:
+            self.indices = np.flatnonzero(self.mask)
+        return self.indices
+    
+    def guess_pool(self):
+        """Return the hint table indices of the words that can be guessed: in
+        hard mode, the words that follow the hints so far, and otherwise the 
+        remaining possible guesses."""
+        if self.hard_mode == False:
+            return self.candidate_indices()
+        if self.allowed_indices is None:
+            self.allowed_indices = np.flatnonzero(self.allowed)
+        return self.allowed_indices
+    
     #METHODS FOR GUESSING
     
     def make_guess(self):
-        self.guess = random.choice(list(self.words))
+        self.guess = WordleGuesser.word_list[random.choice(self.candidate_indices())]
         return self.guess
     
+    def score_guesses(self, guesses):
+        """Return a score for each guess in guesses (an array of vocabulary 
+        indices), where higher scores are better guesses. Random guessing only
+        prefers words that could still be the solution."""
+        return self.mask[guesses].astype(np.float64)
+    
+    def best_scored(self, guesses, scores):
+        """Return the guess in guesses (an array of vocabulary indices) with 
+        the highest score. Ties go to words that are still possible, then to 
+        the word that comes first alphabetically."""
+        best = np.flatnonzero(scores == np.max(scores))
+        possible = best[self.mask[guesses[best]]]
+        if len(possible) > 0:
+            best = possible
+        return WordleGuesser.word_list[guesses[best[0]]]
+    
+    def top_guesses(self, k=10, all_words=False):
+        """Return the k best guesses as (word, score) pairs, best first, 
+        scoring the words in the guess pool (or every word in the vocabulary, 
+        if all_words is True) in one call to score_guesses. Only the top k are 
+        sorted; ties go to the word that comes first alphabetically."""
+        if all_words == True:
+            guesses = np.arange(len(WordleGuesser.word_list))
+        else:
+            guesses = self.guess_pool()
+        k = min(k, len(guesses))
+        if k == 0:
+            return []
+        scores = np.asarray(self.score_guesses(guesses), dtype=np.float64)
+        
+        #the kth best score, then every better score and as many words tied 
+        #with it as are needed, in vocabulary order
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        better = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[:k - len(better)]
+        top = np.concatenate([better, tied])
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(WordleGuesser.word_list[guesses[i]], float(scores[i])) for i in top]
+    
+    def decision_key(self):
+        """Return a key identifying the guesser's strategy, vocabulary and 
+        remaining possible words (and, in hard mode, allowed guesses)."""
+        fingerprint = hashlib.blake2b(np.packbits(self.mask).tobytes(), 
+                                      digest_size=16).digest()
+        strategy = type(self).__name__
+        if self.approximate == True:
+            strategy += f' sampled {self.sample_size} {WordleGuesser.KEEP} {WordleGuesser.MAX_SAMPLE}'
+        if self.hard_mode == False:
+            return (strategy, WordleGuesser.vocab_key, fingerprint)
+        allowed = hashlib.blake2b(np.packbits(self.allowed).tobytes(), 
+                                  digest_size=16).digest()
+        return (strategy, WordleGuesser.vocab_key, fingerprint, allowed)
+    
+    def halving_work(self, num_guesses, num_targets):
+        """Return the number of guess-word pairs halving_guess scores when 
+        picking from num_guesses guesses with num_targets remaining words."""
+        work = 0
+        sample_size = self.sample_size
+        while sample_size < num_targets and num_guesses > WordleGuesser.MIN_SURVIVORS:
+            work += num_guesses * sample_size
+            num_guesses = max(WordleGuesser.MIN_SURVIVORS, int(np.ceil(num_guesses * WordleGuesser.KEEP)))
+            sample_size = min(2 * sample_size, WordleGuesser.MAX_SAMPLE)
+        return work + num_guesses * min(num_targets, WordleGuesser.MAX_SAMPLE)
+    
+    def halving_guess(self, guesses, score):
+        """Return the best of guesses (an array of vocabulary indices) by 
+        successive halving, where score(guesses, targets) scores guesses 
+        against targets. Each round scores the surviving guesses against a 
+        new random sample of the remaining words, keeps the best KEEP of them
+        and doubles the sample size, up to MAX_SAMPLE. Once the sample would 
+        hold every remaining word, or only MIN_SURVIVORS guesses are left, 
+        the survivors are scored against every remaining word (or a sample of
+        MAX_SAMPLE of them, if there are more). Turns where that would cost 
+        more than scoring every guess exactly (see SAMPLING_COST) are scored 
+        exactly. Samples are seeded by the remaining words, so the same words
+        always give the same guess."""
+        pool = guesses
+        targets = self.candidate_indices()
+        
+        exact_work = len(guesses) * len(targets)
+        if exact_work <= type(self).SAMPLING_COST * self.halving_work(len(guesses), len(targets)):
+            if self.check_exact == True:
+                self.sampling_stats['exact turns'] += 1
+            return self.best_scored(guesses, score(guesses, targets))
+        
+        seed = hashlib.blake2b(WordleGuesser.SEED.encode() + np.packbits(self.mask).tobytes(),
+                               digest_size=8).digest()
+        rng = np.random.default_rng(int.from_bytes(seed, 'big'))
+        sample_size = self.sample_size
+        while sample_size < len(targets) and len(guesses) > WordleGuesser.MIN_SURVIVORS:
+            sample = np.sort(rng.choice(targets, sample_size, replace=False))
+            scores = np.asarray(score(guesses, sample), dtype=np.float64)
+            
+            #best scores first, then words that are still possible, then 
+            #alphabetical order
+            order = np.lexsort((np.arange(len(guesses)), ~self.mask[guesses], -scores))
+            kept = max(WordleGuesser.MIN_SURVIVORS, int(np.ceil(len(guesses) * WordleGuesser.KEEP)))
+            guesses = np.sort(guesses[order[:kept]])
+            sample_size = min(2 * sample_size, WordleGuesser.MAX_SAMPLE)
+        final = targets
+        if len(targets) > WordleGuesser.MAX_SAMPLE:
+            final = np.sort(rng.choice(targets, WordleGuesser.MAX_SAMPLE, replace=False))
+        guess = self.best_scored(guesses, score(guesses, final))
+        
+        if self.check_exact == True:
+            exact_scores = score(pool, targets)
+            exact = self.best_scored(pool, exact_scores)
+            stats = self.sampling_stats
+            stats['sampled turns'] += 1
+            if stats['fewest sampled'] is None or len(targets) < stats['fewest sampled']:
+                stats['fewest sampled'] = len(targets)
+            if stats['most sampled'] is None or len(targets) > stats['most sampled']:
+                stats['most sampled'] = len(targets)
+            if guess != exact:
+                self.sampling_stats['disagreements'] += 1
+                index = WordleGuesser.vocab.index
+                lost = exact_scores[pool == index[exact]] - exact_scores[pool == index[guess]]
+                self.sampling_stats['score lost'] += float(lost[0])
+        return guess
+    
+    def cached_guess(self, choose):
+        """Return the guess choose() makes for the remaining possible words,
+        reusing the guess made the last time the same words remained."""
+        key = self.decision_key()
+        guess = WordleGuesser.decision_cache.get(key)
+        if guess is None:
+            guess = choose()
+            WordleGuesser.decision_cache.put(key, guess)
+        return guess
+    
     #METHODS FOR FILTERING POSSIBLE WORDS
     
     def _update_min_counts(self):
@@ -81,50 +337,63 @@ class WordleGuesser:
         for letter in gold_green:
             self.min_counts[letter] = gold_green[letter]
             
-    def _filter_gray(self, word, letter):
-        if self.letter_counts[word][letter] <= self.min_counts[letter]:
-            return True
-        return False
-    
-    def _filter_gold(self, word, letter, index):
-        if word[index] != letter and (self.letter_counts[word][letter] >= 
-                                      self.min_counts[letter]):
-            return True
-        return False
-    
-    def _filter_green(self, word, letter, index):
-        if word[index] == letter:
-            return True
-        return False
-    
-    def _keep_word(self, word):
-        keep = True
-        for i in range(len(self.hints)):
-            try:
-                letter = self.guess[i]
-            except IndexError:
-                raise IndexError(f'String index out of range -- guess: {self.guess}, hint: {self.hints}, index: {i}')
-            if self.hints[i] == WordleGuesser.GRAY:
-                keep = self._filter_gray(word, letter)
-            elif self.hints[i] == WordleGuesser.GOLD:
-                keep = self._filter_gold(word, letter, i)
-            elif self.hints[i] == WordleGuesser.GREEN:
-                keep = self._filter_green(word, letter, i)
-            
-            if keep == False:
-                break
-        
-        return keep
-    
     def filt(self, hints):
         """Filter possible guesses based on hint (a string)."""
         self.hints = hints
         self._update_min_counts()
         
-        for word in list(self.words):
-            if self._keep_word(word) == False:
-                self.words.remove(word)
+        #only the remaining words need checking, so filtering costs scale 
+        #with the number of remaining words rather than the vocabulary size
+        candidates = self.candidate_indices()
+        keep = WordleGuesser.filter_index.matching(self.guess, self.hints,
+                                                   self.min_counts, candidates)
+        self.mask[candidates[~keep]] = False
+        self.indices = candidates[keep]
+        
+        #the allowed guesses only ever shrink, so only the words still 
+        #allowed are checked against the new hint
+        if self.hard_mode == True:
+            allowed = self.guess_pool()
+            keep = WordleGuesser.filter_index.required(self.guess, self.hints, 
+                                                       allowed)
+            self.allowed[allowed[~keep]] = False
+            self.allowed_indices = allowed[keep]
                 
-        if self.hints == WordleGuesser.GREEN * 5:
+        if self.hints == WordleGuesser.GREEN * len(self.guess):
             self.solved = True
-            self.words = set() #no words left to guess
\ No newline at end of file
+            self.mask[self.indices] = False #no words left to guess
+            self.indices = self.indices[:0]
+    
+    #METHODS FOR EXPLORING HINTS
+    
+    def push(self, guess, hints):
+        """Filter possible guesses as if guess got hints, remembering what 
+        changed so pop() can undo it. Only the removed words are recorded, so
+        branching costs scale with the number of words a hint removes."""
+        candidates = self.candidate_indices()
+        allowed = self.guess_pool()
+        previous = (candidates, allowed, self.min_counts.copy(), self.__dict__.get('guess'), 
+                    self.__dict__.get('hints'), self.solved, 
+                    self.__dict__.get('guess_count'))
+        
+        self.guess = guess
+        self.filt(hints)
+        removed = candidates[~self.mask[candidates]]
+        disallowed = allowed[~self.allowed[allowed]] if self.hard_mode == True else allowed[:0]
+        self.undo_stack.append((removed, disallowed) + previous)
+        
+    def pop(self):
+        """Undo the most recent push."""
+        (removed, disallowed, candidates, allowed, min_counts, guess, hints, 
+         solved, guess_count) = self.undo_stack.pop()
+        self.mask[removed] = True
+        self.indices = candidates
+        if self.hard_mode == True:
+            self.allowed[disallowed] = True
+            self.allowed_indices = allowed
+        self.min_counts = min_counts
+        self.guess = guess
+        self.hints = hints
+        self.solved = solved
+        if guess_count is not None:
+            self.guess_count = guess_count